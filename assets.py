@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AssetRegistry:
+    """Lazily built assets with background prefetching in priority order
+
+    `get(name)` (or `registry[name]`) returns an asset, building it on the spot
+    if the prefetcher hasn't got to it yet. `prefetch()` starts building
+    everything in the background, lowest priority number first, so the assets
+    needed for the first frame are ready before effects and music. An asset's
+    optional `finalize` function post-processes the built result (e.g. to
+    convert surfaces to the display format) and is timed along with it.
+
+    CPU-heavy work that doesn't need pygame (audio synthesis) can be handed
+    the separate `synthesis_executor()`.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.timings = {}
+        self.wall_time = 0.0
+        self._synthesis_executor = None
+        self.priorities = {}
+        self.builders = {}
+        self.results = {}
+        self.errors = {}
+        self.events = {}
+        self.claimed = set()
+        self.lock = threading.Lock()
+        self._prefetch_pool = None
+
+    def add(self, name, build, *args, priority=0, finalize=None, **kwargs):
+        """Register an asset; nothing is built until it is requested or prefetched"""
+        if finalize is not None:
+            build = self._finalized(build, finalize)
+        self.builders[name] = (build, args, kwargs)
+        self.priorities[name] = priority
+        self.events[name] = threading.Event()
+
+    @staticmethod
+    def _finalized(build, finalize):
+        return lambda *args, **kwargs: finalize(build(*args, **kwargs))
+
+    def _timed(self, name, build, args, kwargs):
+        start = time.perf_counter()
+        try:
+            return build(*args, **kwargs)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def _build(self, name):
+        """Build an asset unless another thread already claimed it, then wait for it"""
+        with self.lock:
+            claimed = name in self.claimed
+            self.claimed.add(name)
+        if not claimed:
+            build, args, kwargs = self.builders[name]
+            try:
+                self.results[name] = self._timed(name, build, args, kwargs)
+            except Exception as e:
+                self.errors[name] = e
+            finally:
+                self.events[name].set()
+            if self._prefetch_pool is not None and self.is_ready(*self.events):
+                self.wall_time = time.perf_counter() - self._prefetch_start
+        self.events[name].wait()
+
+    def get(self, name):
+        """Return an asset, building it now if it isn't ready yet"""
+        if not self.events[name].is_set():
+            self._build(name)
+        if name in self.errors:
+            raise self.errors[name]
+        return self.results[name]
+
+    __getitem__ = get
+
+    def prefetch(self):
+        """Start building every registered asset in the background, in priority order"""
+        if self._prefetch_pool is not None:
+            return
+        self._prefetch_start = time.perf_counter()
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                 thread_name_prefix="asset-prefetch")
+        for name in sorted(self.builders, key=lambda n: self.priorities[n]):
+            self._prefetch_pool.submit(self._build, name)
+        self._prefetch_pool.shutdown(wait=False)
+
+    def run(self):
+        """Build everything now, in parallel, and wait for it"""
+        self.prefetch()
+        self.wait(self.builders)
+        self.shutdown()
+
+    def is_ready(self, *names):
+        """True once all of the named assets have finished building (or failed)"""
+        return all(self.events[name].is_set() for name in names)
+
+    def ready_up_to(self, priority):
+        """True once every asset with a priority number <= `priority` is ready"""
+        return self.is_ready(*[n for n, p in self.priorities.items() if p <= priority])
+
+    def progress(self):
+        """Return (ready, total) asset counts"""
+        ready = sum(1 for event in self.events.values() if event.is_set())
+        return ready, len(self.events)
+
+    def wait(self, names, timeout=None):
+        """Block until the named assets are ready; returns False on timeout"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for name in names:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not self.events[name].wait(remaining):
+                return False
+        return True
+
+    def synthesis_executor(self):
+        """Executor for CPU-bound work that doesn't touch pygame, such as sound synthesis
+
+        NumPy releases the GIL, so threads run synthesis in parallel. The
+        pure-Python fallback holds the GIL and gets no speedup from them, but
+        worker processes are not an option: by the time sounds are built the
+        process runs prefetch threads and SDL's audio thread, and forking a
+        multi-threaded process can deadlock the child.
+        """
+        if self._synthesis_executor is None:
+            self._synthesis_executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                          thread_name_prefix="synthesis")
+        return self._synthesis_executor
+
+    def shutdown(self):
+        if self._synthesis_executor is not None:
+            self._synthesis_executor.shutdown()
+            self._synthesis_executor = None
+
+    def report(self, first_frame_time=None):
+        """Return a human-readable summary of the per-asset build times"""
+        lines = ["Asset pipeline (%d jobs, %d workers):" % (len(self.builders), self.max_workers)]
+        for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1]):
+            lines.append("  %-20s %8.2f ms" % (name, seconds * 1000))
+        lines.append("  %-20s %8.2f ms" % ("sum of jobs", sum(self.timings.values()) * 1000))
+        lines.append("  %-20s %8.2f ms" % ("wall time", self.wall_time * 1000))
+        if first_frame_time is not None:
+            lines.append("  %-20s %8.2f ms" % ("time to first frame", first_frame_time * 1000))
+        return "\n".join(lines)
@@ -0,0 +1,136 @@
+"""Play many seeded headless games in parallel and summarize how they went.
+
+Each game runs until it is lost (or --max-ticks pass), played by one of the
+scripted controllers in controllers.py. Games are spread over a pool of worker processes, one per CPU core
+by default, and the same --seed always gives the same results whatever the
+number of workers:
+
+    python batch.py --games 1000 --seed 1
+    python batch.py --games 200 --seed 1 --controller bot
+    python batch.py --games 1000 --seed 1 --workers 1 --output results.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Workers inherit this, so each doesn't print pygame's banner
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from controllers import CONTROLLERS
+
+ENTITY_KINDS = ("chickens", "eggs", "bullets", "powerups", "explosions")
+
+
+def play(job):
+    """Worker: play one game; the game module is imported once per worker process"""
+    import headless
+    seed, max_ticks, controller = job
+    result = headless.play_game(seed, max_ticks, headless.make_controller(controller))
+    result["tick_rate"] = headless.game.TICK_RATE
+    return result
+
+
+def game_seeds(seed, games):
+    """Derive one seed per game from the batch seed"""
+    rng = random.Random(seed)
+    return [rng.getrandbits(63) for _ in range(games)]
+
+
+def distribution(values):
+    """Mean and nearest-rank percentiles of a list of numbers"""
+    values = sorted(values)
+    rank = lambda fraction: values[max(0, math.ceil(fraction * len(values)) - 1)]
+    return {"mean": sum(values) / len(values), "min": values[0], "p10": rank(0.1), "p50": rank(0.5),
+            "p90": rank(0.9), "max": values[-1]}
+
+
+def histogram(values, bins=10):
+    """(low, high, count) buckets spanning the values"""
+    low, high = min(values), max(values)
+    width = max(1, math.ceil((high - low + 1) / bins))
+    counts = [0] * bins
+    for value in values:
+        counts[min(bins - 1, (value - low) // width)] += 1
+    return [(low + i * width, low + (i + 1) * width - 1, count) for i, count in enumerate(counts)]
+
+
+def summarize(results):
+    """Aggregate per-game results into survival, score and peak entity statistics"""
+    tick_rate = results[0]["tick_rate"]
+    scores = [result["score"] for result in results]
+    return {
+        "games": len(results),
+        "survived": sum(result["survived"] for result in results),
+        "survival_seconds": distribution([result["ticks"] / tick_rate for result in results]),
+        "score": distribution(scores),
+        "score_histogram": histogram(scores),
+        "peak_entities": {kind: distribution([result["peak_entities"][kind] for result in results])
+                          for kind in ENTITY_KINDS},
+    }
+
+
+def run_batch(games, seed=None, workers=None, max_ticks=36000, controller="sweep"):
+    """Play `games` games over `workers` processes (one per core if None); returns (summary, results)"""
+    if games < 1:
+        raise ValueError("a batch needs at least one game, got %d" % games)
+    workers = workers or os.cpu_count() or 1
+    jobs = [(game_seed, max_ticks, controller) for game_seed in game_seeds(seed, games)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A few chunks per worker keeps every core busy without per-game IPC overhead
+        results = list(pool.map(play, jobs, chunksize=max(1, games // (workers * 4))))
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    summary.update({"seed": seed, "workers": workers, "max_ticks": max_ticks, "controller": controller,
+                    "seconds": elapsed, "games_per_second": games / elapsed if elapsed else float("inf")})
+    return summary, results
+
+
+def positive_int(text):
+    """argparse type for counts that must be at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1, got %d" % value)
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=positive_int, default=1000, help="number of games to play (default 1000)")
+    parser.add_argument("--seed", type=int, default=None, help="seed the per-game seeds are drawn from")
+    parser.add_argument("--workers", type=positive_int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--max-ticks", type=int, default=36000,
+                        help="stop a game that lasts this long (default: 10 minutes at 60 ticks/s)")
+    parser.add_argument("--controller", choices=sorted(CONTROLLERS), default="sweep",
+                        help="scripted player for every game (default sweep)")
+    parser.add_argument("--output", help="write the summary and every game's result to a JSON file")
+    args = parser.parse_args()
+
+    summary, results = run_batch(args.games, args.seed, args.workers, args.max_ticks, args.controller)
+    print("Played %d games on %d workers in %.2f s (%.1f games/s)" %
+          (summary["games"], summary["workers"], summary["seconds"], summary["games_per_second"]))
+    print("Still alive after %d ticks: %d" % (summary["max_ticks"], summary["survived"]))
+    for name, key in (("Survival (s)", "survival_seconds"), ("Score", "score")):
+        print("%-14s mean %.1f  min %g  p10 %g  p50 %g  p90 %g  max %g" % ((name,) + tuple(
+            summary[key][stat] for stat in ("mean", "min", "p10", "p50", "p90", "max"))))
+    print("Score histogram:")
+    for low, high, count in summary["score_histogram"]:
+        print("  %5d-%-5d %6d %s" % (low, high, count, "#" * (60 * count // summary["games"])))
+    print("Peak entities (mean / max per game):")
+    for kind, stats in summary["peak_entities"].items():
+        print("  %-12s %6.1f %6d" % (kind, stats["mean"], stats["max"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
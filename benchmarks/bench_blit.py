@@ -0,0 +1,73 @@
+"""Time blitting each generated sprite as built, after convert_alpha() and with a colorkey.
+
+Run from the repository root:
+
+    python benchmarks/bench_blit.py
+"""
+import os
+import random
+import sys
+import time
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from images.background import create_stars, create_planet
+from images.convert import convert_surface, OPAQUE, COLORKEY, ALPHA
+from images.sprites import (create_player_ship, create_chicken_frames, create_egg,
+                            create_bullet, create_laser_bullet, create_powerup,
+                            create_explosion)
+
+BLITS = 500
+REPEAT = 15
+
+
+def sprites():
+    """(name, surface, the most compact mode that draws it identically)"""
+    return [
+        ("background", create_stars(800, 600, 200), OPAQUE),
+        ("planet", create_planet(80), COLORKEY),
+        ("player", create_player_ship(50, 40), COLORKEY),
+        ("chicken frame", create_chicken_frames(50, 50)[0], COLORKEY),
+        ("egg", create_egg(20, 25), COLORKEY),
+        ("bullet", create_bullet(10, 20), COLORKEY),
+        ("laser bullet", create_laser_bullet(20, 30), ALPHA),
+        ("powerup", create_powerup("triple", 30), ALPHA),
+        ("explosion", create_explosion(4, 10, 50), COLORKEY),
+    ]
+
+
+def median_us(screen, surface, positions):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for position in positions:
+            screen.blit(surface, position)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] / len(positions) * 1e6
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    rng = random.Random(0)
+    positions = [(rng.randint(0, 750), rng.randint(0, 550)) for _ in range(BLITS)]
+
+    print("%-16s%14s%14s%14s" % ("sprite", "as built", "converted", "colorkey"))
+    for name, surface, mode in sprites():
+        row = "%-16s%11.2f us" % (name, median_us(screen, surface, positions))
+        row += "%11.2f us" % median_us(screen, convert_surface(surface, ALPHA if mode == COLORKEY else mode),
+                                      positions)
+        if mode == COLORKEY:
+            row += "%11.2f us" % median_us(screen, convert_surface(surface, COLORKEY), positions)
+        print(row)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
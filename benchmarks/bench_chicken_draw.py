@@ -0,0 +1,77 @@
+"""Compare drawing chickens with per-frame wing ellipses against pre-rendered flap frames.
+
+Run from the repository root:
+
+    python benchmarks/bench_chicken_draw.py
+"""
+import math
+import os
+import random
+import sys
+import time
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from images.sprites import create_chicken, create_chicken_frames
+
+WAVE_SIZES = [24, 40, 200, 1000]
+FRAME_COUNTS = [8, 12, 24]
+REPEAT = 50
+
+
+def make_wave(rng, count):
+    """(x, y, wing phase) for a wave of chickens spread over the screen"""
+    return [(rng.randint(0, 750), rng.randint(0, 550), rng.random() * 2 * math.pi) for _ in range(count)]
+
+
+def draw_ellipses(screen, image, wave):
+    """The old Chicken.draw: one blit plus two immediate-mode wing ellipses"""
+    wing_color = (240, 240, 240)
+    width, height = image.get_size()
+    for x, y, wing in wave:
+        wing_offset = int(math.sin(wing) * 5)
+        screen.blit(image, (x, y))
+        pygame.draw.ellipse(screen, wing_color, (x - 5, y + height // 2 - 10 + wing_offset, 15, 25))
+        pygame.draw.ellipse(screen, wing_color, (x + width - 10, y + height // 2 - 10 - wing_offset, 15, 25))
+
+
+def draw_frames(screen, frames, wave):
+    """The new Chicken.draw: one blit of the nearest pre-rendered frame"""
+    n = len(frames)
+    for x, y, wing in wave:
+        screen.blit(frames[int(wing / (2 * math.pi) * n + 0.5) % n], (x - 5, y))
+
+
+def median_ms(draw, screen, sprite, wave):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        draw(screen, sprite, wave)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    image = create_chicken(50, 50)
+    strips = {n: create_chicken_frames(50, 50, n) for n in FRAME_COUNTS}
+
+    print("%-10s%14s" % ("chickens", "ellipses") + "".join("%14s" % ("%d frames" % n) for n in FRAME_COUNTS))
+    for count in WAVE_SIZES:
+        wave = make_wave(random.Random(count), count)
+        row = "%-10d%11.3f ms" % (count, median_ms(draw_ellipses, screen, image, wave))
+        for n in FRAME_COUNTS:
+            row += "%11.3f ms" % median_ms(draw_frames, screen, strips[n], wave)
+        print(row)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
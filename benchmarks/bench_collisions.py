@@ -0,0 +1,67 @@
+"""Time check_collisions at growing entity counts, for each broadphase mode.
+
+Run from the repository root:
+
+    python benchmarks/bench_collisions.py
+"""
+import os
+import random
+import sys
+import time
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chicken_invaders as game
+
+# (bullets, chickens) per scene
+SCALES = [(5, 24), (25, 40), (100, 100), (250, 250), (500, 500)]
+MODES = ["pairwise", "batch", "grid", "auto"]
+REPEAT = 20
+
+
+def make_scene(rng, bullet_count, chicken_count):
+    """Chickens in wave formation (big waves extend off screen), bullets spread over the play field"""
+    state = game.GameState(rng)
+    player = state.player
+    player.x = -1000  # Keep powerups from being collected
+    for _ in range(bullet_count):
+        x, y = rng.randint(0, game.SCREEN_WIDTH), rng.randint(0, game.SCREEN_HEIGHT)
+        if rng.random() < 0.5:
+            player.bullets.acquire(game.AngleBullet, x, y, rng.choice([-30, -15, 0, 15, 30]))
+        else:
+            player.bullets.acquire(game.Bullet, x, y)
+    rows = (chicken_count + 7) // 8
+    state.chickens = game.create_chickens(rng, rows=rows, cols=8)[:chicken_count]
+    return state
+
+
+def bench(mode, bullet_count, chicken_count):
+    """Return the median time of one check_collisions call in milliseconds"""
+    game.COLLISION_MODE = mode
+    samples = []
+    for i in range(REPEAT):
+        state = make_scene(random.Random(i), bullet_count, chicken_count)
+        start = time.perf_counter()
+        game.check_collisions(state)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    # Don't let background asset prefetching compete with the timings
+    game.assets.wait(list(game.assets.events))
+
+    print("%-18s" % "bullets x chickens" + "".join("%12s" % mode for mode in MODES))
+    for bullet_count, chicken_count in SCALES:
+        row = "%-18s" % ("%d x %d" % (bullet_count, chicken_count))
+        for mode in MODES:
+            row += "%9.3f ms" % bench(mode, bullet_count, chicken_count)
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
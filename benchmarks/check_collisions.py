@@ -0,0 +1,183 @@
+"""Check that every collision mode gives the same results as the original loops.
+
+The broadphases in collision.py and the batched egg and power-up passes in
+check_collisions must not change what happens in a game. This replays
+seeded scenes through a copy of the original nested loops and through
+check_collisions in every mode, and compares the outcome: score, lives,
+which entities were removed, explosions, the active power-up and the random
+power-up drops. Run from the repository root:
+
+    python benchmarks/check_collisions.py
+    python benchmarks/check_collisions.py --scenes 1000
+"""
+import argparse
+import os
+import random
+import sys
+
+# Run without a window or audio device
+os.environ["CHICKEN_INVADERS_HEADLESS"] = "1"
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import pygame
+
+import chicken_invaders as game
+from bench_collisions import make_scene
+from collision import auto_hits, batch_hits, grid_hits, pairwise_hits
+
+FINDERS = {"pairwise": pairwise_hits, "batch": batch_hits, "grid": grid_hits, "auto": auto_hits}
+
+
+def reference_collisions(state):
+    """The original per-pair collision loops, kept as the behaviour to match"""
+    player = state.player
+    chickens = state.chickens
+
+    # Check bullet-chicken collisions
+    for bullet in player.bullets[:]:
+        for chicken in chickens[:]:
+            bullet_rect = pygame.Rect(bullet.x - bullet.width // 2, bullet.y,
+                                      bullet.width, bullet.height)
+            chicken_rect = pygame.Rect(chicken.x + 5, chicken.y + 5,
+                                       chicken.width - 10, chicken.height - 10)
+
+            if bullet_rect.colliderect(chicken_rect):
+                if bullet in player.bullets:
+                    player.bullets.release(bullet)
+                if chicken in chickens:
+                    chickens.remove(chicken)
+                    state.score += 10
+                    state.explosions.acquire(game.Explosion, chicken.x + chicken.width // 2,
+                                             chicken.y + chicken.height // 2)
+                    if state.rng.random() < 0.3:
+                        powerup_type = state.rng.choice([game.POWERUP_TRIPLE, game.POWERUP_LASER,
+                                                         game.POWERUP_MULTI])
+                        state.powerups.append(game.PowerUp(chicken.x + chicken.width // 2,
+                                                           chicken.y + chicken.height // 2,
+                                                           powerup_type, state.rng))
+
+    # Check egg-player collisions
+    for egg in state.eggs[:]:
+        egg_rect = pygame.Rect(egg.x - egg.width // 2 + 5, egg.y + 5,
+                               egg.width - 10, egg.height - 10)
+        player_rect = pygame.Rect(player.x + 5, player.y + 5,
+                                  player.width - 10, player.height - 10)
+
+        if egg_rect.colliderect(player_rect):
+            state.eggs.release(egg)
+            state.lives -= 1
+            state.explosions.acquire(game.Explosion, player.x + player.width // 2,
+                                     player.y + player.height // 2)
+            player.current_powerup = None
+
+    # Check powerup-player collisions
+    for powerup in state.powerups[:]:
+        powerup_rect = pygame.Rect(powerup.x - powerup.width // 2, powerup.y - powerup.height // 2,
+                                   powerup.width, powerup.height)
+        player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
+
+        if powerup_rect.colliderect(player_rect):
+            player.activate_powerup(powerup.type)
+            state.powerups.remove(powerup)
+
+
+def scene(seed):
+    """A seeded scene of bullets, chickens, eggs and power-ups, many of them touching the player"""
+    rng = random.Random(seed)
+    state = make_scene(rng, rng.randint(0, 300), rng.randint(0, 300))
+    player = state.player
+    player.x = rng.randint(0, game.SCREEN_WIDTH - player.width)
+    if rng.random() < 0.5:
+        player.activate_powerup(rng.choice([game.POWERUP_TRIPLE, game.POWERUP_LASER, game.POWERUP_MULTI]))
+    for _ in range(rng.randint(0, 30)):
+        state.eggs.acquire(game.Egg, player.x + rng.randint(-40, 90), player.y + rng.randint(-50, 50),
+                           rng.uniform(-2, 2))
+    for _ in range(rng.randint(0, 10)):
+        state.powerups.append(game.PowerUp(player.x + rng.randint(-40, 90), player.y + rng.randint(-50, 50),
+                                           rng.choice([game.POWERUP_TRIPLE, game.POWERUP_LASER,
+                                                       game.POWERUP_MULTI]), rng))
+    return state
+
+
+def outcome(state):
+    """Everything check_collisions can change, in comparable form"""
+    player = state.player
+    return {
+        "score": state.score,
+        "lives": state.lives,
+        "chickens": [(chicken.x, chicken.y) for chicken in state.chickens],
+        "bullets": [(type(bullet).__name__, bullet.x, bullet.y) for bullet in player.bullets],
+        "eggs": [(egg.x, egg.y) for egg in state.eggs],
+        "powerups": [(powerup.x, powerup.y, powerup.type) for powerup in state.powerups],
+        "explosions": [(explosion.x, explosion.y) for explosion in state.explosions],
+        "powerup": (player.current_powerup, player.powerup_ticks),
+        "rng": state.rng.getstate(),
+    }
+
+
+def random_rects(rng, count, extent):
+    """Rects of mixed sizes, some empty, some spanning several grid cells or off screen"""
+    return [pygame.Rect(rng.randint(-100, extent), rng.randint(-100, extent),
+                        rng.choice([0, rng.randint(1, 20), rng.randint(1, 200)]),
+                        rng.choice([0, rng.randint(1, 20), rng.randint(1, 200)]))
+            for _ in range(count)]
+
+
+def check_finders(scenes):
+    """Every hit finder must report the same hits in the same order as pairwise_hits"""
+    failures = 0
+    for seed in range(scenes):
+        rng = random.Random(seed)
+        extent = rng.choice([200, 800, 3000])
+        bullets = random_rects(rng, rng.randint(0, 150), extent)
+        targets = random_rects(rng, rng.randint(0, 150), extent)
+        expected = list(pairwise_hits(bullets, targets))
+        for name, find_hits in FINDERS.items():
+            if list(find_hits(bullets, targets)) != expected:
+                print("hit finder %s differs from pairwise on rect scene %d" % (name, seed))
+                failures += 1
+    return failures
+
+
+def check_game(scenes):
+    """check_collisions must leave every scene exactly as the original loops did, in every mode"""
+    failures = 0
+    saved_mode = game.COLLISION_MODE
+    try:
+        for seed in range(scenes):
+            state = scene(seed)
+            reference_collisions(state)
+            expected = outcome(state)
+            for mode in game.HIT_FINDERS:
+                game.COLLISION_MODE = mode
+                state = scene(seed)
+                game.check_collisions(state)
+                if outcome(state) != expected:
+                    print("collision mode %s differs from the original loops on game scene %d" % (mode, seed))
+                    failures += 1
+    finally:
+        game.COLLISION_MODE = saved_mode
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenes", type=int, default=300, help="seeded scenes to check (default 300)")
+    args = parser.parse_args()
+
+    # Sprites the entities use must be built before scenes can be made
+    game.assets.wait(list(game.assets.events))
+
+    failures = check_finders(args.scenes) + check_game(args.scenes)
+    if failures:
+        print("\n%d mismatch(es)" % failures)
+        return 1
+    print("All %d collision modes matched the original loops on %d rect and %d game scenes" %
+          (len(game.HIT_FINDERS), args.scenes, args.scenes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
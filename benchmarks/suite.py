@@ -0,0 +1,258 @@
+"""Benchmark suite for the game's hot paths, with baseline comparison.
+
+Runs headless (dummy SDL drivers) with fixed seeds and scripted scene sizes,
+and writes machine-readable results. Run from the repository root:
+
+    python benchmarks/suite.py                           # run and compare with the stored baseline
+    python benchmarks/suite.py --output results.json     # also save this run's results
+    python benchmarks/suite.py --save-baseline           # replace the stored baseline
+    python benchmarks/suite.py --filter collisions       # only cases whose name contains "collisions"
+
+The suite runs several interleaved rounds and keeps each case's fastest
+median, then exits with status 1 if any case is more than --tolerance slower
+than the baseline. Baselines are machine specific: regenerate one on the
+machine that runs the comparison.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# Run without a window or audio device, with a fixed star field
+os.environ["CHICKEN_INVADERS_HEADLESS"] = "1"
+os.environ.setdefault("CHICKEN_INVADERS_STARFIELD_SEED", "1")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import pygame
+
+import chicken_invaders as game
+from bench_collisions import make_scene
+from images.background import StarField, create_planet
+from images.sprites import (create_player_ship, create_chicken_frames, create_egg,
+                            create_bullet, create_laser_bullet, create_powerup,
+                            create_explosion)
+from sounds import synth
+from sounds.sound_manager import EFFECT_SPECS, MUSIC_SPEC, MIXER_FREQUENCY
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+SEED = 1234
+
+# Cheap cases are called in a loop until a sample takes at least this long
+MIN_SAMPLE_SECONDS = 0.002
+
+# Changes smaller than this are treated as timer noise, whatever the ratio
+NOISE_FLOOR_MS = 0.05
+
+
+def case_collisions(mode, bullet_count, chicken_count):
+    def setup():
+        game.COLLISION_MODE = mode
+        rng = random.Random(SEED)
+        # Collisions consume the scene, so every sample gets a fresh one
+        prepare = lambda: make_scene(rng, bullet_count, chicken_count)
+        return prepare, game.check_collisions
+    return setup
+
+
+def case_chicken_draw(count):
+    def setup():
+        chickens = game.create_chickens(random.Random(SEED), rows=(count + 7) // 8, cols=8)[:count]
+        return None, lambda: [chicken.draw() for chicken in chickens]
+    return setup
+
+
+def case_egg_draw(count):
+    def setup():
+        rng = random.Random(SEED)
+        eggs = []
+        for _ in range(count):
+            egg = game.Egg(rng.randint(0, game.SCREEN_WIDTH), rng.randint(0, game.SCREEN_HEIGHT),
+                           rng.uniform(-2, 2))
+            egg.rotation = rng.uniform(0, 360)
+            eggs.append(egg)
+        return None, lambda: [egg.draw() for egg in eggs]
+    return setup
+
+
+def case_draw_background():
+    game.renderer.set_backdrop(game.assets["backdrop"])
+    return None, game.draw_background
+
+
+def case_draw_ui():
+    state = game.GameState(random.Random(SEED))
+    state.player.activate_powerup(game.POWERUP_TRIPLE)
+    return None, lambda: game.draw_ui(state)
+
+
+def case_build(build, *args):
+    return lambda: (None, lambda: build(*args))
+
+
+def case_effect(name):
+    spec = dict(EFFECT_SPECS[name], sample_rate=MIXER_FREQUENCY)
+    return lambda: (None, lambda: synth.render_effect(spec, rng=random.Random(SEED)))
+
+
+def case_music():
+    spec = dict(MUSIC_SPEC, sample_rate=MIXER_FREQUENCY)
+    return None, lambda: synth.render_music(spec)
+
+
+# name -> (setup, repeat count). setup() returns (prepare, run): run is timed,
+# prepare (if not None) builds a fresh argument for each run, untimed
+CASES = {}
+for _mode in ("pairwise", "batch", "grid", "auto"):
+    for _bullets, _chickens in ((25, 40), (100, 100), (500, 500)):
+        CASES["collisions/%s/%dx%d" % (_mode, _bullets, _chickens)] = (
+            case_collisions(_mode, _bullets, _chickens), 20)
+CASES.update({
+    "draw/chickens/40": (case_chicken_draw(40), 50),
+    "draw/eggs/50": (case_egg_draw(50), 50),
+    "draw/background": (case_draw_background, 50),
+    "draw/ui": (case_draw_ui, 50),
+    "assets/player_ship": (case_build(create_player_ship, 50, 40), 20),
+    "assets/chicken_frames": (case_build(create_chicken_frames, 50, 50, game.CHICKEN_FRAMES), 10),
+    "assets/egg": (case_build(create_egg, 20, 25), 20),
+    "assets/bullet": (case_build(create_bullet, 10, 20), 20),
+    "assets/laser_bullet": (case_build(create_laser_bullet, 20, 30), 20),
+    "assets/powerups": (case_build(lambda: [create_powerup(t, 30) for t in ("triple", "laser", "multi")]), 10),
+    "assets/explosion_frames": (case_build(lambda: [create_explosion(i, 10, 50) for i in range(10)]), 10),
+    "assets/starfield": (case_build(StarField, 800, 600, 200), 5),
+    "assets/planet": (case_build(create_planet, 80), 10),
+    "sound/shoot": (case_effect("shoot"), 10),
+    "sound/explosion": (case_effect("explosion"), 10),
+    "sound/powerup": (case_effect("powerup"), 10),
+    "sound/hit": (case_effect("hit"), 10),
+    "sound/music": (case_music, 3),
+})
+
+
+def calls_per_sample(run):
+    """Like timeit's autorange: how many calls make a sample long enough to time reliably"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS:
+            return number
+        number *= 2
+
+
+def time_case(setup, repeat):
+    """Return (median, min) milliseconds of one run, after a warm-up run"""
+    random.seed(SEED)
+    prepare, run = setup()
+    # Runs that consume a prepared argument can't be repeated within a sample
+    number = 1 if prepare else calls_per_sample(run)
+    samples = []
+    # As timeit does, keep collector pauses out of the samples
+    gc.collect()
+    gc.disable()
+    try:
+        for i in range(repeat + 1):
+            random.seed(SEED + i)
+            args = (prepare(),) if prepare else ()
+            start = time.perf_counter()
+            for _ in range(number):
+                run(*args)
+            elapsed = (time.perf_counter() - start) / number
+            if i:
+                samples.append(elapsed)
+    finally:
+        gc.enable()
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[0] * 1000
+
+
+def run_suite(name_filter=None, rounds=5):
+    """Time every case `rounds` times, interleaved, keeping each case's best round"""
+    # Let background asset building finish so it neither competes with timings nor uses the RNG
+    game.assets.wait(list(game.assets.events))
+    results = {}
+    for _ in range(rounds):
+        for name, (setup, repeat) in CASES.items():
+            if name_filter and name_filter not in name:
+                continue
+            median, fastest = time_case(setup, repeat)
+            best = results.get(name)
+            if best is None or median < best["median_ms"]:
+                results[name] = {"median_ms": median, "min_ms": fastest, "repeat": repeat}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": synth.np.__version__ if synth.np is not None else None,
+            "platform": platform.platform(),
+            "seed": SEED,
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print each case against the baseline; returns the names of regressed cases"""
+    regressions = []
+    print("%-34s%12s%12s%9s" % ("case", "median", "baseline", "ratio"))
+    for name, result in results["results"].items():
+        median = result["median_ms"]
+        base = baseline["results"].get(name)
+        if base is None:
+            print("%-34s%9.3f ms%12s%9s" % (name, median, "-", "new"))
+            continue
+        base_median = base["median_ms"]
+        ratio = median / base_median if base_median else float("inf")
+        regressed = ratio > 1 + tolerance and median - base_median > NOISE_FLOOR_MS
+        if regressed:
+            regressions.append(name)
+        print("%-34s%9.3f ms%9.3f ms%8.2fx%s" % (name, median, base_median, ratio,
+                                                 "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write this run's results to a JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown before a case counts as a regression (default 0.5 = 50%%)")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="times to run the whole suite; each case keeps its fastest round (default 5)")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    args = parser.parse_args()
+
+    results = run_suite(args.filter, args.rounds)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print("Saved baseline with %d cases to %s" % (len(results["results"]), args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline at %s; run with --save-baseline to create one" % args.baseline)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n%d case(s) regressed by more than %d%%: %s" %
+              (len(regressions), args.tolerance * 100, ", ".join(regressions)))
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
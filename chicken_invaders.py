@@ -4,18 +4,43 @@ import sys
 import time
 import math
 import os
+import zlib
+
+# Measure cold start from the moment the game module starts loading
+STARTUP_START = time.perf_counter()
 
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import custom modules
-from images.background import create_stars, create_planet
-from images.sprites import (create_player_ship, create_chicken, create_egg, 
+from assets import AssetRegistry
+from collision import auto_hits, batch_hits, grid_hits, pairwise_hits
+from controllers import CONTROLLERS
+import entities
+from entities import SwarmWorld, BULLET_NORMAL, BULLET_LASER, BULLET_ANGLE
+from pool import ObjectPool
+from profiler import FrameProfiler
+from renderer import DirtyRectRenderer
+from replay import InputLog, pack_input, unpack_input
+from sprite_cache import RotationCache, TextCache, ROTATION_CACHE_BYTES
+from telemetry import TelemetryWriter, DEFAULT_MAX_BYTES as TELEMETRY_MAX_BYTES
+from images.convert import finalizer, COLORKEY, ALPHA
+from images.background import StarField, create_planet
+from images.sprites import (create_player_ship, create_chicken_frames, create_egg, 
                           create_bullet, create_laser_bullet, create_powerup,
                           create_explosion)
-from sounds.sound_manager import SoundManager
+from sounds.sound_manager import (SoundManager, MIXER_FREQUENCY, MIXER_SIZE,
+                                  MIXER_CHANNELS, MIXER_BUFFER)
+
+# Headless mode (CHICKEN_INVADERS_HEADLESS=1) runs the game logic with no window and no
+# audio, for simulations on machines without a display (see headless.py)
+HEADLESS = os.environ.get("CHICKEN_INVADERS_HEADLESS") == "1"
+if HEADLESS:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
 
-# Initialize pygame
+# Initialize pygame, opening the audio device once in the format every sound is built for
+pygame.mixer.pre_init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
 pygame.init()
 
 # Screen dimensions
@@ -37,46 +62,163 @@ ORANGE = (255, 165, 0)
 
 # Game variables
 clock = pygame.time.Clock()
-FPS = 60
-score = 0
-lives = 3
-game_over = False
+
+FPS = 60  # Render frame cap
+START_LIVES = 3
+
+# Game logic advances in fixed ticks of simulation time, whatever the render rate.
+# A slow frame runs several ticks to catch up (skipping renders rather than slowing
+# the game down), up to MAX_TICKS_PER_FRAME before it gives up and lets time slip
+TICK_RATE = 60
+TICK_SECONDS = 1 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5
 font = pygame.font.SysFont(None, 36)
 small_font = pygame.font.SysFont(None, 24)
 
+# HUD text is only re-rendered when it changes
+text_cache = TextCache()
+
+# Dirty-rect rendering (CHICKEN_INVADERS_DIRTY_RECTS=1) only repaints and presents
+# the parts of the screen that changed; otherwise every frame is a full redraw + flip
+renderer = DirtyRectRenderer(screen, dirty_rects=os.environ.get("CHICKEN_INVADERS_DIRTY_RECTS") == "1")
+
+# Per-phase frame timings, shown with P; saved upon exit to the .csv or .json path
+# in CHICKEN_INVADERS_PROFILE when it is set
+profiler = FrameProfiler()
+PROFILE_PATH = os.environ.get("CHICKEN_INVADERS_PROFILE")
+
+# Save the session's seed and per-tick input to this path upon exit, or play back
+# a saved session instead of reading the keyboard
+RECORD_PATH = os.environ.get("CHICKEN_INVADERS_RECORD")
+REPLAY_PATH = os.environ.get("CHICKEN_INVADERS_REPLAY")
+
+# Let a scripted player (see controllers.py) play instead of the keyboard, e.g. "bot"
+CONTROLLER = os.environ.get("CHICKEN_INVADERS_CONTROLLER")
+if CONTROLLER and CONTROLLER not in CONTROLLERS:
+    print("Warning: unknown controller %r; playing from the keyboard" % CONTROLLER)
+    CONTROLLER = None
+
+# Per-tick telemetry (score, lives, entity counts, power-up, frame time) streamed to
+# this path in binary, rotated every CHICKEN_INVADERS_TELEMETRY_SIZE bytes
+TELEMETRY_PATH = os.environ.get("CHICKEN_INVADERS_TELEMETRY")
+TELEMETRY_SIZE = int(os.environ.get("CHICKEN_INVADERS_TELEMETRY_SIZE", TELEMETRY_MAX_BYTES))
+
+# Translucent layer that darkens the game over screen
+game_over_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA).convert_alpha()
+game_over_overlay.fill((0, 0, 0, 180))
+
+# Bullet-chicken collision broadphase: "auto" (batch for normal waves, grid for
+# swarm-sized ones), "grid" (spatial hash), "batch" (one collidelistall call per
+# bullet) or "pairwise"
+HIT_FINDERS = {"auto": auto_hits, "grid": grid_hits, "batch": batch_hits, "pairwise": pairwise_hits}
+COLLISION_MODE = os.environ.get("CHICKEN_INVADERS_COLLISIONS", "auto")
+if COLLISION_MODE not in HIT_FINDERS:
+    print("Warning: unknown collision mode %r; using auto" % COLLISION_MODE)
+    COLLISION_MODE = "auto"
+
+# Swarm mode: waves of this many rows of 16 chickens, kept in NumPy arrays (0 = off)
+SWARM_ROWS = int(os.environ.get("CHICKEN_INVADERS_SWARM", "0"))
+if SWARM_ROWS and entities.np is None:
+    print("Warning: swarm mode needs NumPy; falling back to normal waves")
+    SWARM_ROWS = 0
+
 # Power-up types
 POWERUP_TRIPLE = "triple"
 POWERUP_LASER = "laser"
 POWERUP_MULTI = "multi"
-POWERUP_DURATION = 20  # seconds
-
-# Initialize sound manager
-try:
-    sound_manager = SoundManager()
-    sound_enabled = True
-except Exception as e:
-    print(f"Warning: Sound initialization failed: {e}")
-    sound_enabled = False
-
-# Create game assets
-background = create_stars(SCREEN_WIDTH, SCREEN_HEIGHT, 200)
-planet = create_planet(80)
+POWERUP_DURATION = 20  # seconds of simulation time
+
+# Asset priorities: lower numbers are prefetched first
+PRIORITY_FIRST_FRAME = 0  # Needed to draw the very first frame
+PRIORITY_GAMEPLAY = 1  # Needed as soon as anything is fired or dropped
+PRIORITY_EFFECTS = 2  # Explosions, sound effects and music can fill in afterwards
+
+# Object pool capacities: spare objects kept per class for reuse
+BULLET_POOL_SIZE = 128
+EGG_POOL_SIZE = 64
+EXPLOSION_POOL_SIZE = 32
+
+# Sprites without translucent pixels are converted to use a colorkey (fastest to
+# blit) unless CHICKEN_INVADERS_SPRITE_TRANSPARENCY=alpha keeps per-pixel alpha
+SPRITE_TRANSPARENCY = os.environ.get("CHICKEN_INVADERS_SPRITE_TRANSPARENCY", COLORKEY)
+
+# Star field: twinkling stars from a fixed seed (random when unset), plus optional
+# parallax layers of (star count, pixels scrolled per frame)
+STARFIELD_SEED = os.environ.get("CHICKEN_INVADERS_STARFIELD_SEED")
+STARFIELD_LAYERS = [(60, 0.25), (30, 0.6)] if os.environ.get("CHICKEN_INVADERS_PARALLAX") == "1" else []
+
+# Pre-rendered frames in one chicken wing-flap cycle
+CHICKEN_FRAMES = 12
+
+# Rotated sprites are cached at this angle step (degrees), shared by every egg and bullet
+ROTATION_STEP = float(os.environ.get("CHICKEN_INVADERS_ROTATION_STEP", "5"))
+if not ROTATION_STEP > 0:  # Also catches NaN
+    print("Warning: rotation step must be positive, got %g; using 5 degrees" % ROTATION_STEP)
+    ROTATION_STEP = 5.0
+rotations = RotationCache(ROTATION_STEP, ROTATION_CACHE_BYTES)
+
+def create_sound_manager():
+    """Build the sound manager, synthesizing sounds in parallel; returns None if sound fails"""
+    if HEADLESS:
+        return None
+    try:
+        sound_manager = SoundManager(executor=assets.synthesis_executor())
+    except Exception as e:
+        print(f"Warning: Sound initialization failed: {e}")
+        return None
+    finally:
+        assets.shutdown()
+    if os.environ.get("CHICKEN_INVADERS_STARTUP_REPORT") == "1":
+        print(sound_manager.startup_report())
+    return sound_manager
+
 planet_pos = (SCREEN_WIDTH - 150, 150)
 
-# Preload sprite images
-player_img = create_player_ship(50, 40)
-chicken_img = create_chicken(50, 50)
-egg_img = create_egg(20, 25)
-bullet_img = create_bullet(10, 20)
-laser_bullet_img = create_laser_bullet(20, 30)
-powerup_imgs = {
+def create_backdrop(background, planet, planet_pos):
+    """Composite the static starfield and planet into one full-screen surface"""
+    backdrop = background.copy()
+    backdrop.blit(planet, planet_pos)
+    return backdrop
+
+# Game assets are built lazily on first use and prefetched in the background, then
+# converted to the display's pixel format so blits don't convert every pixel
+sprite = finalizer(SPRITE_TRANSPARENCY)
+assets = AssetRegistry()
+assets.add("starfield", StarField, SCREEN_WIDTH, SCREEN_HEIGHT, 200, layers=STARFIELD_LAYERS,
+           seed=STARFIELD_SEED, priority=PRIORITY_FIRST_FRAME)
+assets.add("planet", create_planet, 80, priority=PRIORITY_FIRST_FRAME, finalize=sprite)
+assets.add("backdrop", lambda: create_backdrop(assets["starfield"].background, assets["planet"], planet_pos),
+           priority=PRIORITY_FIRST_FRAME)
+assets.add("player", create_player_ship, 50, 40, priority=PRIORITY_FIRST_FRAME, finalize=sprite)
+assets.add("chicken_frames", create_chicken_frames, 50, 50, CHICKEN_FRAMES, priority=PRIORITY_FIRST_FRAME,
+           finalize=sprite)
+assets.add("egg", create_egg, 20, 25, priority=PRIORITY_GAMEPLAY, finalize=sprite)
+assets.add("bullet", create_bullet, 10, 20, priority=PRIORITY_GAMEPLAY, finalize=sprite)
+assets.add("laser_bullet", create_laser_bullet, 20, 30, priority=PRIORITY_GAMEPLAY, finalize=finalizer(ALPHA))
+assets.add("powerups", lambda: {
     POWERUP_TRIPLE: create_powerup(POWERUP_TRIPLE, 30),
     POWERUP_LASER: create_powerup(POWERUP_LASER, 30),
     POWERUP_MULTI: create_powerup(POWERUP_MULTI, 30)
-}
+}, priority=PRIORITY_GAMEPLAY, finalize=finalizer(ALPHA))
+assets.add("powerup_icons", lambda: {powerup_type: pygame.transform.scale(image, (20, 20))
+                                     for powerup_type, image in assets["powerups"].items()},
+           priority=PRIORITY_GAMEPLAY)
+assets.add("explosion_frames", lambda: [create_explosion(i, 10, 50) for i in range(10)],
+           priority=PRIORITY_EFFECTS, finalize=sprite)
+assets.add("sounds", create_sound_manager, priority=PRIORITY_EFFECTS)
+assets.prefetch()
+
+def get_sound_manager():
+    """Return the sound manager, or None while it is still loading or if sound is unavailable"""
+    if not assets.is_ready("sounds"):
+        return None
+    return assets["sounds"]
 
-# Create explosion animation frames
-explosion_frames = [create_explosion(i, 10, 50) for i in range(10)]
+def play_sound(sound_name):
+    """Play a sound effect if sound has finished loading"""
+    sound_manager = get_sound_manager()
+    if sound_manager:
+        sound_manager.play_sound(sound_name)
 
 # Player class
 class Player:
@@ -85,31 +227,35 @@ class Player:
         self.height = 40
         self.x = SCREEN_WIDTH // 2 - self.width // 2
         self.y = SCREEN_HEIGHT - 70
+        self.prev_x = self.x
         self.speed = 8
-        self.bullets = []
+        self.bullets = ObjectPool(BULLET_POOL_SIZE)
+        for bullet_class in (Bullet, LaserBullet, AngleBullet):
+            self.bullets.prefill(bullet_class)
         self.cooldown = 0
         self.cooldown_max = 15
-        self.image = player_img
+        self.image = assets["player"]
         
         # Power-up attributes
         self.current_powerup = None
-        self.powerup_end_time = 0
+        self.powerup_ticks = 0  # Ticks until the power-up expires
         
         # Animation attributes
         self.thrust_animation = 0
 
-    def draw(self):
-        # Draw the player ship
-        screen.blit(self.image, (self.x, self.y))
+    def draw(self, alpha=1.0):
+        # Draw the player ship, interpolated between the last two ticks
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        ship_rect = screen.blit(self.image, (x, self.y))
         
         # Draw engine thrust animation
-        self.thrust_animation = (self.thrust_animation + 0.2) % 2
         thrust_height = 10 + int(5 * math.sin(self.thrust_animation * math.pi))
-        pygame.draw.polygon(screen, ORANGE, [
-            (self.x + self.width // 2 - 8, self.y + self.height),
-            (self.x + self.width // 2, self.y + self.height + thrust_height),
-            (self.x + self.width // 2 + 8, self.y + self.height)
+        thrust_rect = pygame.draw.polygon(screen, ORANGE, [
+            (x + self.width // 2 - 8, self.y + self.height),
+            (x + self.width // 2, self.y + self.height + thrust_height),
+            (x + self.width // 2 + 8, self.y + self.height)
         ])
+        return ship_rect.union(thrust_rect)
 
     def move(self, direction):
         if direction == "left" and self.x > 0:
@@ -121,107 +267,128 @@ class Player:
         if self.cooldown <= 0:
             if self.current_powerup == POWERUP_TRIPLE:
                 # Triple shot - three bullets in a spread pattern
-                self.bullets.append(Bullet(self.x + self.width // 2, self.y))
-                self.bullets.append(Bullet(self.x + self.width // 2 - 15, self.y + 10))
-                self.bullets.append(Bullet(self.x + self.width // 2 + 15, self.y + 10))
-                if sound_enabled:
-                    sound_manager.play_sound("shoot")
+                self.bullets.acquire(Bullet, self.x + self.width // 2, self.y)
+                self.bullets.acquire(Bullet, self.x + self.width // 2 - 15, self.y + 10)
+                self.bullets.acquire(Bullet, self.x + self.width // 2 + 15, self.y + 10)
+                play_sound("shoot")
             elif self.current_powerup == POWERUP_LASER:
                 # Laser beam - wider, more powerful bullet
-                self.bullets.append(LaserBullet(self.x + self.width // 2, self.y))
-                if sound_enabled:
-                    sound_manager.play_sound("shoot")
+                self.bullets.acquire(LaserBullet, self.x + self.width // 2, self.y)
+                play_sound("shoot")
             elif self.current_powerup == POWERUP_MULTI:
                 # Multi-direction - bullets in 5 directions
                 for angle in [-30, -15, 0, 15, 30]:
-                    self.bullets.append(AngleBullet(self.x + self.width // 2, self.y, angle))
-                if sound_enabled:
-                    sound_manager.play_sound("shoot")
+                    self.bullets.acquire(AngleBullet, self.x + self.width // 2, self.y, angle)
+                play_sound("shoot")
             else:
                 # Normal bullet
-                self.bullets.append(Bullet(self.x + self.width // 2, self.y))
-                if sound_enabled:
-                    sound_manager.play_sound("shoot")
+                self.bullets.acquire(Bullet, self.x + self.width // 2, self.y)
+                play_sound("shoot")
             
             self.cooldown = self.cooldown_max
 
     def update(self):
         if self.cooldown > 0:
             self.cooldown -= 1
+        self.thrust_animation = (self.thrust_animation + 0.2) % 2
         
-        # Update bullets
-        for bullet in self.bullets[:]:
+        # Update bullets, walking backwards so swap-removal never skips one
+        bullets = self.bullets
+        for i in range(len(bullets) - 1, -1, -1):
+            bullet = bullets[i]
             bullet.update()
             if bullet.y < 0 or bullet.x < 0 or bullet.x > SCREEN_WIDTH:
-                self.bullets.remove(bullet)
+                bullets.release(bullet)
         
         # Check if power-up has expired
-        if self.current_powerup and time.time() > self.powerup_end_time:
-            self.current_powerup = None
+        if self.current_powerup:
+            self.powerup_ticks -= 1
+            if self.powerup_ticks <= 0:
+                self.current_powerup = None
 
     def activate_powerup(self, powerup_type):
         self.current_powerup = powerup_type
-        self.powerup_end_time = time.time() + POWERUP_DURATION
-        if sound_enabled:
-            sound_manager.play_sound("powerup")
+        self.powerup_ticks = POWERUP_DURATION * TICK_RATE
+        play_sound("powerup")
 
-    def draw_bullets(self):
-        for bullet in self.bullets:
-            bullet.draw()
+    def draw_bullets(self, alpha=1.0):
+        return [bullet.draw(alpha) for bullet in self.bullets]
 
-# Bullet classes
+# Bullet classes - pooled, so all state is set in reset()
 class Bullet:
+    __slots__ = ("x", "y", "prev_x", "prev_y", "width", "height", "speed", "image", "_pool_index")
+    kind = BULLET_NORMAL
+    
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
+        self.reset(x, y)
+    
+    def reset(self, x, y):
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
         self.width = 10
         self.height = 20
         self.speed = 10
-        self.image = bullet_img
+        self.image = assets["bullet"]
 
     def update(self):
+        self.prev_y = self.y
         self.y -= self.speed
 
-    def draw(self):
-        screen.blit(self.image, (self.x - self.width // 2, self.y))
+    def draw(self, alpha=1.0):
+        # Interpolate between the last two ticks
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return screen.blit(self.image, (x - self.width // 2, y))
 
 class LaserBullet(Bullet):
-    def __init__(self, x, y):
-        super().__init__(x, y)
+    __slots__ = ()
+    kind = BULLET_LASER
+    
+    def reset(self, x, y):
+        super().reset(x, y)
         self.width = 20
         self.height = 30
-        self.image = laser_bullet_img
+        self.image = assets["laser_bullet"]
 
 class AngleBullet(Bullet):
+    __slots__ = ("angle", "speed_x", "speed_y")
+    kind = BULLET_ANGLE
+    
     def __init__(self, x, y, angle):
-        super().__init__(x, y)
+        self.reset(x, y, angle)
+    
+    def reset(self, x, y, angle):
+        super().reset(x, y)
         self.angle = angle
         self.speed_x = self.speed * pygame.math.Vector2(1, 0).rotate(angle).x
         self.speed_y = self.speed * pygame.math.Vector2(1, 0).rotate(angle).y
         
         # Rotate the bullet image
-        self.image = pygame.transform.rotate(bullet_img, -angle)
+        self.image = rotations.get(assets["bullet"], -angle)
 
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.speed_x
         self.y -= self.speed_y
 
 # PowerUp class
 class PowerUp:
-    def __init__(self, x, y, powerup_type):
+    def __init__(self, x, y, powerup_type, rng):
         self.x = x
-        self.y = y
+        self.y = self.prev_y = y
         self.width = 30
         self.height = 30
         self.speed = 3
         self.type = powerup_type
-        self.image = powerup_imgs[powerup_type]
+        self.image = assets["powerups"][powerup_type]
         
         # Animation attributes
         self.animation_offset = 0
-        self.animation_speed = random.uniform(0.05, 0.1)
+        self.animation_speed = rng.uniform(0.05, 0.1)
 
     def update(self):
+        self.prev_y = self.y
         self.y += self.speed
         
         # Floating animation
@@ -229,32 +396,36 @@ class PowerUp:
         if self.animation_offset > 2 * math.pi:
             self.animation_offset -= 2 * math.pi
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         # Add floating effect
         offset_x = int(math.sin(self.animation_offset) * 5)
         offset_y = int(math.cos(self.animation_offset) * 3)
+        y = self.prev_y + (self.y - self.prev_y) * alpha
         
         # Draw power-up with animation
-        screen.blit(self.image, (self.x - self.width // 2 + offset_x, 
-                                self.y - self.height // 2 + offset_y))
+        return screen.blit(self.image, (self.x - self.width // 2 + offset_x, 
+                                       y - self.height // 2 + offset_y))
 
 # Chicken class
 class Chicken:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng):
         self.width = 50
         self.height = 50
-        self.x = x
-        self.y = y
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
         self.speed = 2
         self.direction = 1  # 1 for right, -1 for left
-        self.image = chicken_img
+        self.frames = assets["chicken_frames"]
         self.egg_chance = 0.003  # Reduced chance to drop an egg
+        self.rng = rng
         
         # Animation attributes
-        self.wing_animation = random.random() * 2 * math.pi
-        self.wing_speed = random.uniform(0.1, 0.15)
+        self.wing_animation = rng.random() * 2 * math.pi
+        self.wing_speed = rng.uniform(0.1, 0.15)
 
     def update(self, eggs):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.speed * self.direction
         
         # Wing flapping animation
@@ -263,38 +434,38 @@ class Chicken:
             self.wing_animation -= 2 * math.pi
         
         # Randomly drop eggs
-        if random.random() < self.egg_chance:
-            eggs.append(Egg(self.x + self.width // 2, self.y + self.height))
+        if self.rng.random() < self.egg_chance:
+            eggs.acquire(Egg, self.x + self.width // 2, self.y + self.height, self.rng.uniform(-2, 2))
 
-    def draw(self):
-        # Draw the chicken with wing animation
-        wing_offset = int(math.sin(self.wing_animation) * 5)
-        
-        # Draw the base chicken image
-        screen.blit(self.image, (self.x, self.y))
-        
-        # Draw animated wings
-        wing_color = (240, 240, 240)
-        pygame.draw.ellipse(screen, wing_color, 
-                          (self.x - 5, self.y + self.height // 2 - 10 + wing_offset, 15, 25))
-        pygame.draw.ellipse(screen, wing_color, 
-                          (self.x + self.width - 10, self.y + self.height // 2 - 10 - wing_offset, 15, 25))
+    def draw(self, alpha=1.0):
+        # Draw the pre-rendered frame nearest this point of the wing-flap cycle
+        frame = int(self.wing_animation / (2 * math.pi) * len(self.frames) + 0.5) % len(self.frames)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return screen.blit(self.frames[frame], (x - 5, y))
 
 # Egg class
 class Egg:
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "prev_y", "width", "height", "speed", "image", "rotation", "rotation_speed",
+                 "_pool_index")
+    
+    def __init__(self, x, y, rotation_speed=0.0):
+        self.reset(x, y, rotation_speed)
+    
+    def reset(self, x, y, rotation_speed=0.0):
         self.x = x
-        self.y = y
+        self.y = self.prev_y = y
         self.width = 20
         self.height = 25
         self.speed = 3  # Slower egg falling speed
-        self.image = egg_img
+        self.image = assets["egg"]
         
         # Animation attributes
         self.rotation = 0
-        self.rotation_speed = random.uniform(-2, 2)
+        self.rotation_speed = rotation_speed
 
     def update(self):
+        self.prev_y = self.y
         self.y += self.speed
         
         # Rotate the egg as it falls
@@ -304,20 +475,26 @@ class Egg:
         elif self.rotation < 0:
             self.rotation += 360
 
-    def draw(self):
-        # Rotate the egg image
-        rotated_img = pygame.transform.rotate(self.image, self.rotation)
-        # Get the rect of the rotated image to center it properly
-        rect = rotated_img.get_rect(center=(self.x, self.y + self.height // 2))
-        screen.blit(rotated_img, rect)
+    def draw(self, alpha=1.0):
+        # Rotate the egg image (nearest cached angle)
+        rotated_img = rotations.get(self.image, self.rotation)
+        # Get the rect of the rotated image to center it properly, between the last two ticks
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        rect = rotated_img.get_rect(center=(self.x, y + self.height // 2))
+        return screen.blit(rotated_img, rect)
 
 # Explosion class
 class Explosion:
+    __slots__ = ("x", "y", "frame", "max_frames", "animation_speed", "size", "_pool_index")
+    
     def __init__(self, x, y):
+        self.reset(x, y)
+    
+    def reset(self, x, y):
         self.x = x
         self.y = y
         self.frame = 0
-        self.max_frames = len(explosion_frames)
+        self.max_frames = len(assets["explosion_frames"])
         self.animation_speed = 0.5
         self.size = 50
 
@@ -327,92 +504,151 @@ class Explosion:
 
     def draw(self):
         frame_idx = min(int(self.frame), self.max_frames - 1)
-        screen.blit(explosion_frames[frame_idx], 
-                   (self.x - self.size // 2, self.y - self.size // 2))
+        return screen.blit(assets["explosion_frames"][frame_idx], 
+                          (self.x - self.size // 2, self.y - self.size // 2))
 
 # Game functions
-def create_chickens(rows=3, cols=8):
+def create_chickens(rng, rows=3, cols=8):
     chickens = []
     for row in range(rows):
         for col in range(cols):
             x = col * 80 + 100
             y = row * 60 + 50
-            chickens.append(Chicken(x, y))
+            chickens.append(Chicken(x, y, rng))
     return chickens
 
-def check_collisions(player, chickens, eggs, powerups, explosions):
-    global score, lives
+def create_swarm(rng, score=0):
+    """Create a swarm world holding a wave that grows with the score"""
+    # Seeded from the game's RNG so seeded runs are reproducible
+    world = SwarmWorld(SCREEN_WIDTH, SCREEN_HEIGHT, [POWERUP_TRIPLE, POWERUP_LASER, POWERUP_MULTI],
+                       seed=rng.getrandbits(32))
+    spawn_swarm_wave(world, score)
+    return world
+
+def spawn_swarm_wave(world, score):
+    # Waves grow with the score, but every row must start above the player's
+    # ship (at SCREEN_HEIGHT - 70) or its chickens could never be shot
+    top, spacing_y = 40, 25
+    max_rows = (SCREEN_HEIGHT - 70 - world.chicken_size[1] - top) // spacing_y + 1
+    world.spawn_wave(rows=min(max_rows, SWARM_ROWS + score // 200), cols=16, spacing_x=40,
+                     spacing_y=spacing_y, left=40, top=top)
+
+def update_swarm(state):
+    """Advance the swarm by one frame and apply its collisions"""
+    player = state.player
+    world = state.swarm
+    
+    world.update()
+    kills, egg_hits, collected = world.check_collisions(player)
+    
+    if kills:
+        state.score += 10 * kills
+        play_sound("explosion")
+    if egg_hits:
+        state.lives -= egg_hits
+        play_sound("hit")
+        # Remove power-up when player loses a life
+        player.current_powerup = None
+    for powerup_type in collected:
+        player.activate_powerup(powerup_type)
+
+def swarm_images():
+    """Sprites used to draw the swarm, including one rotated bullet per multi-shot angle"""
+    return {
+        "chicken_frames": assets["chicken_frames"],
+        "egg": assets["egg"],
+        "bullet": assets["bullet"],
+        "laser_bullet": assets["laser_bullet"],
+        "angle_bullets": {angle: rotations.get(assets["bullet"], -angle)
+                          for angle in (-30, -15, 0, 15, 30)},
+        "rotations": rotations,
+        "powerups": assets["powerups"],
+        "explosion_frames": assets["explosion_frames"],
+    }
+
+def bullet_rect(bullet):
+    return pygame.Rect(bullet.x - bullet.width // 2, bullet.y, bullet.width, bullet.height)
+
+def chicken_hitbox(chicken):
+    # Adjust collision box for better gameplay
+    return pygame.Rect(chicken.x + 5, chicken.y + 5, chicken.width - 10, chicken.height - 10)
+
+def egg_hitbox(egg):
+    # Adjust collision box for better gameplay
+    return pygame.Rect(egg.x - egg.width // 2 + 5, egg.y + 5, egg.width - 10, egg.height - 10)
+
+def powerup_rect(powerup):
+    return pygame.Rect(powerup.x - powerup.width // 2, powerup.y - powerup.height // 2,
+                       powerup.width, powerup.height)
+
+def check_collisions(state):
+    player = state.player
+    chickens = state.chickens
+    eggs = state.eggs
+    powerups = state.powerups
+    explosions = state.explosions
+    rng = state.rng
     
     # Check bullet-chicken collisions
-    for bullet in player.bullets[:]:
-        for chicken in chickens[:]:
-            # Adjust collision box for better gameplay
-            bullet_rect = pygame.Rect(bullet.x - bullet.width // 2, bullet.y, 
-                                     bullet.width, bullet.height)
-            chicken_rect = pygame.Rect(chicken.x + 5, chicken.y + 5, 
-                                      chicken.width - 10, chicken.height - 10)
-            
-            if bullet_rect.colliderect(chicken_rect):
-                if bullet in player.bullets:
-                    player.bullets.remove(bullet)
-                if chicken in chickens:
-                    chickens.remove(chicken)
-                    score += 10
-                    
-                    # Add explosion
-                    explosions.append(Explosion(chicken.x + chicken.width // 2, 
-                                              chicken.y + chicken.height // 2))
-                    if sound_enabled:
-                        sound_manager.play_sound("explosion")
-                    
-                    # 30% chance to drop a power-up
-                    if random.random() < 0.3:
-                        powerup_type = random.choice([POWERUP_TRIPLE, POWERUP_LASER, POWERUP_MULTI])
-                        powerups.append(PowerUp(chicken.x + chicken.width // 2, 
-                                              chicken.y + chicken.height // 2, powerup_type))
-    
-    # Check egg-player collisions
-    for egg in eggs[:]:
-        # Adjust collision box for better gameplay
-        egg_rect = pygame.Rect(egg.x - egg.width // 2 + 5, egg.y + 5, 
-                              egg.width - 10, egg.height - 10)
-        player_rect = pygame.Rect(player.x + 5, player.y + 5, 
-                                 player.width - 10, player.height - 10)
-        
-        if egg_rect.colliderect(player_rect):
-            eggs.remove(egg)
-            lives -= 1
-            if sound_enabled:
-                sound_manager.play_sound("hit")
+    bullets = player.bullets[:]
+    targets = chickens[:]
+    find_hits = HIT_FINDERS[COLLISION_MODE]
+    for i, j in find_hits([bullet_rect(bullet) for bullet in bullets],
+                          [chicken_hitbox(chicken) for chicken in targets]):
+        bullet = bullets[i]
+        chicken = targets[j]
+        if bullet in player.bullets:
+            player.bullets.release(bullet)
+        if chicken in chickens:
+            chickens.remove(chicken)
+            state.score += 10
             
-            # Add explosion at player position
-            explosions.append(Explosion(player.x + player.width // 2, 
-                                       player.y + player.height // 2))
+            # Add explosion
+            explosions.acquire(Explosion, chicken.x + chicken.width // 2, 
+                               chicken.y + chicken.height // 2)
+            play_sound("explosion")
             
-            # Remove power-up when player loses a life
-            player.current_powerup = None
+            # 30% chance to drop a power-up
+            if rng.random() < 0.3:
+                powerup_type = rng.choice([POWERUP_TRIPLE, POWERUP_LASER, POWERUP_MULTI])
+                powerups.append(PowerUp(chicken.x + chicken.width // 2, 
+                                      chicken.y + chicken.height // 2, powerup_type, rng))
     
-    # Check powerup-player collisions
-    for powerup in powerups[:]:
-        # Adjust collision box for better gameplay
-        powerup_rect = pygame.Rect(powerup.x - powerup.width // 2, powerup.y - powerup.height // 2, 
-                                  powerup.width, powerup.height)
-        player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
+    # Check egg-player collisions: one C-level pass over every egg's hitbox
+    player_hitbox = pygame.Rect(player.x + 5, player.y + 5, player.width - 10, player.height - 10)
+    falling_eggs = eggs[:]
+    for index in player_hitbox.collidelistall([egg_hitbox(egg) for egg in falling_eggs]):
+        eggs.release(falling_eggs[index])
+        state.lives -= 1
+        play_sound("hit")
         
-        if powerup_rect.colliderect(player_rect):
-            player.activate_powerup(powerup.type)
-            powerups.remove(powerup)
+        # Add explosion at player position
+        explosions.acquire(Explosion, player.x + player.width // 2, 
+                           player.y + player.height // 2)
+        
+        # Remove power-up when player loses a life
+        player.current_powerup = None
+    
+    # Check powerup-player collisions
+    player_rect = pygame.Rect(player.x, player.y, player.width, player.height)
+    falling_powerups = powerups[:]
+    for index in player_rect.collidelistall([powerup_rect(powerup) for powerup in falling_powerups]):
+        powerup = falling_powerups[index]
+        player.activate_powerup(powerup.type)
+        powerups.remove(powerup)
 
-def draw_ui(player):
+def draw_ui(state):
+    player = state.player
+    
     # Draw score and lives
-    score_text = font.render(f"Score: {score}", True, WHITE)
-    lives_text = font.render(f"Lives: {lives}", True, WHITE)
-    screen.blit(score_text, (10, 10))
-    screen.blit(lives_text, (SCREEN_WIDTH - 120, 10))
+    score_text = text_cache.render(font, f"Score: {state.score}", True, WHITE)
+    lives_text = text_cache.render(font, f"Lives: {state.lives}", True, WHITE)
+    rects = [screen.blit(score_text, (10, 10)),
+             screen.blit(lives_text, (SCREEN_WIDTH - 120, 10))]
     
     # Display current power-up and time remaining
     if player.current_powerup:
-        time_left = int(player.powerup_end_time - time.time())
+        time_left = player.powerup_ticks // TICK_RATE
         if time_left > 0:
             powerup_name = ""
             if player.current_powerup == POWERUP_TRIPLE:
@@ -425,190 +661,401 @@ def draw_ui(player):
                 powerup_name = "Multi Shot"
                 color = ORANGE
                 
-            powerup_text = font.render(f"{powerup_name}: {time_left}s", True, color)
-            screen.blit(powerup_text, (SCREEN_WIDTH // 2 - powerup_text.get_width() // 2, 10))
+            powerup_text = text_cache.render(font, f"{powerup_name}: {time_left}s", True, color)
+            rects.append(screen.blit(powerup_text, (SCREEN_WIDTH // 2 - powerup_text.get_width() // 2, 10)))
             
             # Draw power-up icon
-            icon = powerup_imgs[player.current_powerup]
-            screen.blit(pygame.transform.scale(icon, (20, 20)), 
-                       (SCREEN_WIDTH // 2 - powerup_text.get_width() // 2 - 25, 15))
+            icon = assets["powerup_icons"][player.current_powerup]
+            rects.append(screen.blit(icon, 
+                                     (SCREEN_WIDTH // 2 - powerup_text.get_width() // 2 - 25, 15)))
+    return rects
 
 def draw_background():
-    # Draw starfield background
-    screen.blit(background, (0, 0))
+    # Repaint the starfield and planet backdrop (just the stale parts in dirty-rect mode)
+    renderer.begin()
     
-    # Draw planet
-    screen.blit(planet, planet_pos)
-    
-    # Draw some distant stars with twinkling effect
-    for _ in range(5):
-        x = random.randint(0, SCREEN_WIDTH)
-        y = random.randint(0, SCREEN_HEIGHT)
-        size = random.randint(1, 3)
-        brightness = random.randint(150, 255)
-        pygame.draw.circle(screen, (brightness, brightness, brightness), (x, y), size)
+    # Draw the twinkling stars and parallax layers
+    return assets["starfield"].draw(screen)
 
-def game_over_screen():
+def game_over_screen(score):
     # Darken the screen
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
+    screen.blit(game_over_overlay, (0, 0))
     
     # Draw game over text with glow effect
     for offset in range(5, 0, -1):
         glow_color = (255, 0, 0, 50 // offset)
-        glow_text = font.render("GAME OVER", True, glow_color)
+        glow_text = text_cache.render(font, "GAME OVER", True, glow_color)
         screen.blit(glow_text, (SCREEN_WIDTH // 2 - glow_text.get_width() // 2 + offset, 
                                SCREEN_HEIGHT // 2 - 50 + offset))
         screen.blit(glow_text, (SCREEN_WIDTH // 2 - glow_text.get_width() // 2 - offset, 
                                SCREEN_HEIGHT // 2 - 50 - offset))
     
-    game_over_text = font.render("GAME OVER", True, RED)
-    score_text = font.render(f"Final Score: {score}", True, WHITE)
-    restart_text = font.render("Press R to restart or Q to quit", True, WHITE)
+    game_over_text = text_cache.render(font, "GAME OVER", True, RED)
+    score_text = text_cache.render(font, f"Final Score: {score}", True, WHITE)
+    restart_text = text_cache.render(font, "Press R to restart or Q to quit", True, WHITE)
     
     screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 50))
     screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2))
     screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
 
+def loading_screen():
+    screen.fill(BLACK)
+    
+    # Draw loading text and a progress bar
+    ready, total = assets.progress()
+    loading_text = text_cache.render(font, "Loading...", True, WHITE)
+    screen.blit(loading_text, (SCREEN_WIDTH // 2 - loading_text.get_width() // 2, SCREEN_HEIGHT // 2 - 40))
+    bar_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2, 300, 16)
+    pygame.draw.rect(screen, WHITE, bar_rect, 2)
+    pygame.draw.rect(screen, YELLOW, (bar_rect.x + 3, bar_rect.y + 3,
+                                      (bar_rect.width - 6) * ready // total, bar_rect.height - 6))
+
 def show_fps(clock):
-    fps_text = small_font.render(f"FPS: {int(clock.get_fps())}", True, WHITE)
-    screen.blit(fps_text, (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 30))
+    fps_text = text_cache.render(small_font, f"FPS: {int(clock.get_fps())}", True, WHITE)
+    return screen.blit(fps_text, (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 30))
+
+class GameState:
+    """Score, lives and entities of one game in progress
+    
+    Every random decision in the game draws from `rng`, so independent games
+    can run side by side and a seeded game always plays out the same way.
+    """
+    
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+        self.score = 0
+        self.lives = START_LIVES
+        self.game_over = False
+        self.ticks = 0  # Simulation time, in ticks of TICK_SECONDS
+        self.player = Player()
+        self.chickens = create_chickens(self.rng)
+        self.eggs = ObjectPool(EGG_POOL_SIZE)
+        self.eggs.prefill(Egg)
+        self.powerups = []
+        self.explosions = ObjectPool(EXPLOSION_POOL_SIZE)
+        self.explosions.prefill(Explosion)
+        
+        # In swarm mode every entity except the player lives in the swarm's arrays
+        self.swarm = None
+        if SWARM_ROWS:
+            self.swarm = create_swarm(self.rng)
+            self.chickens = []
+    
+    def entity_counts(self):
+        """Return the number of live entities of each kind, including swarm entities"""
+        counts = {"chickens": len(self.chickens), "eggs": len(self.eggs),
+                  "bullets": len(self.player.bullets), "powerups": len(self.powerups),
+                  "explosions": len(self.explosions)}
+        if self.swarm is not None:
+            for kind in ("chickens", "eggs", "bullets", "powerups", "explosions"):
+                counts[kind] += len(getattr(self.swarm, kind))
+        return counts
+    
+    def checksum(self):
+        """CRC of the score, lives and every entity position, to check two runs stayed in step"""
+        positions = [self.score, self.lives, self.ticks, self.player.x, self.player.current_powerup]
+        for group in (self.player.bullets, self.chickens, self.eggs, self.powerups, self.explosions):
+            positions.extend((entity.x, entity.y) for entity in group)
+        if self.swarm is not None:
+            for kind in ("chickens", "eggs", "bullets", "powerups"):
+                arrays = getattr(self.swarm, kind)
+                positions.append((arrays.x.tolist(), arrays.y.tolist()))
+        return zlib.crc32(repr(positions).encode("utf-8"))
+
+def new_game(seed=None):
+    """Return the state of a fresh game, its RNG seeded with `seed` (randomly if None)"""
+    return GameState(random.Random(seed))
+
+def step_game(state, left=False, right=False, shoot=False):
+    """Advance the game by one tick with the given controls held (or fire pressed)"""
+    if state.game_over:
+        return
+    state.ticks += 1
+    player = state.player
+    player.prev_x = player.x
+    
+    if shoot:
+        player.shoot()
+    if left:
+        player.move("left")
+    if right:
+        player.move("right")
+    
+    # Swarm bullets are moved by the swarm, so hand new shots over before the
+    # player moves its own; otherwise they would move twice on their first tick
+    if state.swarm is not None:
+        state.swarm.absorb_bullets(player.bullets)
+    player.update()
+    profiler.mark("player_update")
+    
+    # Update chickens
+    change_direction = False
+    for chicken in state.chickens:
+        chicken.update(state.eggs)
+        # Check if any chicken hits the edge
+        if (chicken.x <= 0 and chicken.direction == -1) or (chicken.x + chicken.width >= SCREEN_WIDTH and chicken.direction == 1):
+            change_direction = True
+    
+    # Change direction if needed
+    if change_direction:
+        for chicken in state.chickens:
+            chicken.direction *= -1
+            chicken.y += 20  # Move chickens down
+    profiler.mark("chicken_update")
+    
+    # Update eggs (backwards, as releasing swaps the last egg into place)
+    eggs = state.eggs
+    for i in range(len(eggs) - 1, -1, -1):
+        egg = eggs[i]
+        egg.update()
+        if egg.y > SCREEN_HEIGHT:
+            eggs.release(egg)
+    profiler.mark("egg_update")
+    
+    # Update power-ups
+    for powerup in state.powerups[:]:
+        powerup.update()
+        if powerup.y > SCREEN_HEIGHT:
+            state.powerups.remove(powerup)
+    profiler.mark("powerup_update")
+    
+    # Update explosions
+    explosions = state.explosions
+    for i in range(len(explosions) - 1, -1, -1):
+        explosion = explosions[i]
+        if not explosion.update():
+            explosions.release(explosion)
+    profiler.mark("explosion_update")
+    
+    # Check collisions
+    check_collisions(state)
+    profiler.mark("collisions")
+    
+    if state.swarm is not None:
+        update_swarm(state)
+        profiler.mark("swarm_update")
+    
+    # Check game over conditions
+    if state.lives <= 0:
+        state.game_over = True
+        play_sound("explosion")
+    elif state.swarm is not None:
+        if not state.swarm.chickens.count:
+            spawn_swarm_wave(state.swarm, state.score)
+    elif not state.chickens:
+        # All chickens destroyed - create a new wave with more chickens
+        state.chickens = create_chickens(state.rng, rows=min(5, 3 + state.score // 200), cols=8)
+    profiler.mark("waves")
+
+def run_tick(state, bits):
+    """Run one tick from packed input bits; returns the game state, which a restart replaces"""
+    left, right, shoot, restart = unpack_input(bits)
+    if restart:
+        # The next game carries on from the same RNG, so a whole session replays from one seed
+        state = GameState(state.rng)
+        profiler.mark("waves")
+    step_game(state, left, right, shoot)
+    return state
+
+def session_settings():
+    """Options that change how a session plays out, saved with its recording"""
+    return {"swarm_rows": SWARM_ROWS, "collision_mode": COLLISION_MODE, "tick_rate": TICK_RATE}
+
+def apply_settings(settings):
+    """Switch to the options a recorded session was played with"""
+    global SWARM_ROWS, COLLISION_MODE
+    SWARM_ROWS = settings.get("swarm_rows", SWARM_ROWS)
+    COLLISION_MODE = settings.get("collision_mode", COLLISION_MODE)
+    if settings.get("tick_rate", TICK_RATE) != TICK_RATE:
+        print("Warning: session was recorded at %d ticks per second, replaying at %d" %
+              (settings["tick_rate"], TICK_RATE))
+
+def start_session(seed=None):
+    """Return an InputLog to record into and the first game, both from `seed` (random if None)"""
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+    return InputLog(seed, TICK_RATE, session_settings()), new_game(seed)
+
+def finish_session(log, state):
+    """Store how the session ended in its log, for replays to compare against"""
+    log.result = {"ticks": log.ticks, "score": state.score, "lives": state.lives,
+                  "checksum": state.checksum()}
 
 # Main game function
 def main():
-    global score, lives, game_over
+    # Show a loading state until everything the first frame needs is ready
+    while not assets.ready_up_to(PRIORITY_FIRST_FRAME):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        loading_screen()
+        pygame.display.flip()
+        clock.tick(FPS)
     
-    player = Player()
-    chickens = create_chickens()
-    eggs = []
-    powerups = []
-    explosions = []
+    renderer.set_backdrop(assets["backdrop"])
     
-    # Start background music
-    if sound_enabled:
-        sound_manager.play_background_music()
+    # Play back a recorded session, or start a fresh one (recording it if asked)
+    replay = None
+    if REPLAY_PATH:
+        replay = InputLog.load(REPLAY_PATH)
+        apply_settings(replay.settings)
+        replay_inputs = iter(replay)
+    session, state = start_session(replay.seed if replay else None)
+    controller = CONTROLLERS[CONTROLLER](SCREEN_WIDTH) if CONTROLLER else None
+    telemetry = TelemetryWriter(TELEMETRY_PATH, TICK_RATE, TELEMETRY_SIZE) if TELEMETRY_PATH else None
+    
+    # Swarm waves are drawn from one set of batched sprites
+    if state.swarm is not None:
+        swarm_sprites = swarm_images()
     
     # Game loop
     running = True
     show_fps_counter = False
+    show_profiler = False
+    first_frame_time = None
+    startup_reported = False
+    music_started = False
+    accumulator = 0.0  # Simulation time owed, in seconds
+    shoot = False
+    restart = False
     
     while running:
-        clock.tick(FPS)
+        # Cap the time owed so a long stall doesn't turn into a burst of ticks
+        frame_ms = clock.tick(FPS)
+        accumulator += min(frame_ms / 1000, MAX_TICKS_PER_FRAME * TICK_SECONDS)
+        profiler.start_frame()
         
-        # Event handling
+        # Start background music once sound has loaded, then keep streamed music fed
+        sound_manager = get_sound_manager()
+        if sound_manager:
+            if not music_started:
+                sound_manager.play_background_music()
+                music_started = True
+            sound_manager.update()
+        profiler.mark("audio")
+        
+        # Event handling - fire and restart presses wait for the next tick to run
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and not game_over:
-                    player.shoot()
-                if event.key == pygame.K_r and game_over:
+                if event.key == pygame.K_SPACE and not state.game_over:
+                    shoot = True
+                if event.key == pygame.K_r and state.game_over:
                     # Reset game
-                    player = Player()
-                    chickens = create_chickens()
-                    eggs = []
-                    powerups = []
-                    explosions = []
-                    score = 0
-                    lives = 3
-                    game_over = False
-                if event.key == pygame.K_q and game_over:
+                    restart = True
+                if event.key == pygame.K_q and state.game_over:
                     running = False
                 if event.key == pygame.K_f:
                     show_fps_counter = not show_fps_counter
+                if event.key == pygame.K_p:
+                    show_profiler = not show_profiler
         
-        # Get keys pressed
+        # Get keys pressed and run as many ticks of game logic as the elapsed time calls for
         keys = pygame.key.get_pressed()
-        if not game_over:
-            if keys[pygame.K_LEFT]:
-                player.move("left")
-            if keys[pygame.K_RIGHT]:
-                player.move("right")
-        
-        # Game logic
-        if not game_over:
-            player.update()
-            
-            # Update chickens
-            change_direction = False
-            for chicken in chickens:
-                chicken.update(eggs)
-                # Check if any chicken hits the edge
-                if (chicken.x <= 0 and chicken.direction == -1) or (chicken.x + chicken.width >= SCREEN_WIDTH and chicken.direction == 1):
-                    change_direction = True
-            
-            # Change direction if needed
-            if change_direction:
-                for chicken in chickens:
-                    chicken.direction *= -1
-                    chicken.y += 20  # Move chickens down
-            
-            # Update eggs
-            for egg in eggs[:]:
-                egg.update()
-                if egg.y > SCREEN_HEIGHT:
-                    eggs.remove(egg)
-            
-            # Update power-ups
-            for powerup in powerups[:]:
-                powerup.update()
-                if powerup.y > SCREEN_HEIGHT:
-                    powerups.remove(powerup)
-            
-            # Update explosions
-            for explosion in explosions[:]:
-                if not explosion.update():
-                    explosions.remove(explosion)
-            
-            # Check collisions
-            check_collisions(player, chickens, eggs, powerups, explosions)
+        profiler.mark("events")
+        while accumulator >= TICK_SECONDS:
+            if replay is not None:
+                bits = next(replay_inputs, None)
+                if bits is None:
+                    # End of the recording
+                    running = False
+                    break
+            elif controller is not None:
+                # Scripted players start a new game as soon as one is lost
+                bits = pack_input(*controller(session.ticks, state), restart=state.game_over)
+            else:
+                bits = pack_input(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], shoot, restart)
+            profiler.mark("input")
+            state = run_tick(state, bits)
+            session.record(bits)
+            if telemetry is not None:
+                telemetry.record(session.ticks, state.score, state.lives, state.entity_counts(),
+                                 state.player.current_powerup, frame_ms)
+            profiler.mark("telemetry")
+            shoot = restart = False
+            accumulator -= TICK_SECONDS
             
-            # Check game over conditions
-            if lives <= 0:
-                game_over = True
-                if sound_enabled:
-                    sound_manager.play_sound("explosion")
-            elif not chickens:
-                # All chickens destroyed - create a new wave with more chickens
-                chickens = create_chickens(rows=min(5, 3 + score // 200), cols=8)
+            # Advance the twinkling stars and parallax scrolling
+            assets["starfield"].update()
+            profiler.mark("starfield")
+        
+        # Draw moving entities this far between the last tick and the next
+        alpha = accumulator / TICK_SECONDS
         
-        # Drawing
-        draw_background()
+        # Drawing - every draw call hands the rects it touched to the renderer
+        renderer.add_all(draw_background())
+        profiler.mark("background")
         
-        if not game_over:
+        if not state.game_over:
             # Draw game elements
-            for chicken in chickens:
-                chicken.draw()
-                
-            for egg in eggs:
-                egg.draw()
-                
-            for powerup in powerups:
-                powerup.draw()
+            renderer.add_all(chicken.draw(alpha) for chicken in state.chickens)
+            renderer.add_all(egg.draw(alpha) for egg in state.eggs)
+            renderer.add_all(powerup.draw(alpha) for powerup in state.powerups)
             
-            player.draw()
-            player.draw_bullets()
+            renderer.add(state.player.draw(alpha))
+            renderer.add_all(state.player.draw_bullets(alpha))
             
-            for explosion in explosions:
-                explosion.draw()
+            renderer.add_all(explosion.draw() for explosion in state.explosions)
+            
+            if state.swarm is not None:
+                # Swarm waves fill the screen, so they always redraw all of it
+                state.swarm.draw(screen, swarm_sprites)
+                renderer.invalidate()
+            profiler.mark("entity_draw")
                 
-            draw_ui(player)
+            renderer.add_all(draw_ui(state))
             
             if show_fps_counter:
-                show_fps(clock)
+                renderer.add(show_fps(clock))
+            profiler.mark("ui")
         else:
-            # Draw game over screen
-            for explosion in explosions:
+            # Draw game over screen over the whole display
+            for explosion in state.explosions:
                 explosion.draw()
-            game_over_screen()
+            if state.swarm is not None:
+                state.swarm.draw_explosions(screen, swarm_sprites)
+            profiler.mark("entity_draw")
+            game_over_screen(state.score)
+            renderer.invalidate()
+            profiler.mark("ui")
+        
+        if show_profiler:
+            renderer.add(profiler.draw(screen, small_font, text_cache))
+            profiler.mark("profiler")
         
         # Update display
-        pygame.display.flip()
+        renderer.present()
+        profiler.mark("present")
+        profiler.end_frame(state.entity_counts())
+        
+        # Report startup once the first frame is out and every asset has loaded
+        if first_frame_time is None:
+            first_frame_time = time.perf_counter() - STARTUP_START
+        if not startup_reported and assets.ready_up_to(PRIORITY_EFFECTS):
+            startup_reported = True
+            if os.environ.get("CHICKEN_INVADERS_STARTUP_REPORT") == "1":
+                print(assets.report(first_frame_time))
     
     # Clean up
-    if sound_enabled:
+    if PROFILE_PATH:
+        profiler.dump(PROFILE_PATH)
+    if telemetry is not None:
+        telemetry.close()
+    finish_session(session, state)
+    if RECORD_PATH:
+        session.save(RECORD_PATH)
+    if replay is not None:
+        if session.ticks < replay.ticks:
+            print("Replay stopped after %d of %d ticks" % (session.ticks, replay.ticks))
+        elif session.result == replay.result:
+            print("Replay matched the recording: score %d, lives %d" % (state.score, state.lives))
+        else:
+            print("Replay diverged from the recording: %s, recorded %s" % (session.result, replay.result))
+    sound_manager = get_sound_manager()
+    if sound_manager:
         sound_manager.stop_background_music()
     pygame.quit()
     sys.exit()
@@ -0,0 +1,88 @@
+# Broadphase collision detection between projectiles and targets.
+#
+# Every hit finder reports hits in exactly the order the original bullet x chicken
+# loop visited them: bullets in list order, then targets in list order, with a
+# target dropping out once it has been hit.
+
+# Grid cell size in pixels, a little larger than a chicken
+CELL_SIZE = 64
+
+# Bullet x target pairs above which building the grid pays for itself; below
+# it (every normal wave) one collidelistall call per bullet is faster
+GRID_MIN_PAIRS = 10000
+
+
+class SpatialHash:
+    """Uniform grid that buckets rectangles by the cells they overlap"""
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (range(rect.left // size, (rect.right - 1) // size + 1),
+                range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def insert(self, item, rect):
+        """Add an item under every cell its rect overlaps"""
+        columns, rows = self._cell_range(rect)
+        for cx in columns:
+            for cy in rows:
+                self.cells.setdefault((cx, cy), []).append(item)
+
+    def query(self, rect):
+        """Return the items in the cells `rect` overlaps, in insertion order"""
+        columns, rows = self._cell_range(rect)
+        if len(columns) == 1 and len(rows) == 1:
+            # Most projectiles sit inside a single cell, which is already in order
+            return self.cells.get((columns[0], rows[0]), ())
+        found = set()
+        for cx in columns:
+            for cy in rows:
+                found.update(self.cells.get((cx, cy), ()))
+        return sorted(found)
+
+
+def pairwise_hits(bullet_rects, target_rects):
+    """Yield (bullet index, target index) hits by testing every pair"""
+    alive = [True] * len(target_rects)
+    for i, bullet_rect in enumerate(bullet_rects):
+        for j, target_rect in enumerate(target_rects):
+            if alive[j] and bullet_rect.colliderect(target_rect):
+                alive[j] = False
+                yield i, j
+
+
+def grid_hits(bullet_rects, target_rects, cell_size=CELL_SIZE):
+    """Yield (bullet index, target index) hits, only testing targets in nearby grid cells"""
+    grid = SpatialHash(cell_size)
+    for j, target_rect in enumerate(target_rects):
+        grid.insert(j, target_rect)
+
+    alive = [True] * len(target_rects)
+    for i, bullet_rect in enumerate(bullet_rects):
+        for j in grid.query(bullet_rect):
+            if alive[j] and bullet_rect.colliderect(target_rects[j]):
+                alive[j] = False
+                yield i, j
+
+
+# Hitbox for targets that have already been hit; never collides with anything
+_GONE = (0, 0, 0, 0)
+
+
+def batch_hits(bullet_rects, target_rects):
+    """Yield (bullet index, target index) hits, resolving each bullet with one collidelistall call"""
+    targets = list(target_rects)
+    for i, bullet_rect in enumerate(bullet_rects):
+        for j in bullet_rect.collidelistall(targets):
+            targets[j] = _GONE
+            yield i, j
+
+
+def auto_hits(bullet_rects, target_rects):
+    """Yield (bullet index, target index) hits with whichever finder suits the scene size"""
+    if len(bullet_rects) * len(target_rects) >= GRID_MIN_PAIRS:
+        return grid_hits(bullet_rects, target_rects)
+    return batch_hits(bullet_rects, target_rects)
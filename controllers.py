@@ -0,0 +1,151 @@
+import math
+
+# Bullets fly straight up this many pixels per tick
+BULLET_SPEED = 10
+
+# Ticks an egg stays level with the player once it reaches them (hitbox heights / egg speed)
+EGG_DANGER_TICKS = 15
+
+
+class Controller:
+    """Scripted player: called every tick as controller(tick, state), returns (left, right, shoot)
+
+    `state` is the live GameState; controllers only read it. Anything with
+    the same call signature (a plain function, say) can stand in for one.
+    """
+
+    def __init__(self, screen_width=800):
+        self.screen_width = screen_width
+
+    def __call__(self, tick, state):
+        raise NotImplementedError
+
+
+class SweepController(Controller):
+    """Sweep back and forth across the screen, firing whenever possible"""
+
+    def __init__(self, screen_width=800, period=90):
+        super().__init__(screen_width)
+        self.period = period
+
+    def __call__(self, tick, state):
+        left = (tick // self.period) % 2 == 1
+        return left, not left, True
+
+
+def egg_spans(state):
+    """(left, right, bottom, speed) of every falling egg's hitbox"""
+    spans = [(egg.x - egg.width // 2 + 5, egg.x + egg.width // 2 - 5, egg.y + egg.height - 5, egg.speed)
+             for egg in state.eggs]
+    swarm = state.swarm
+    if swarm is not None and swarm.eggs.count:
+        width, height = swarm.egg_size
+        spans.extend((x - width // 2 + 5, x + width // 2 - 5, y + height - 5, swarm.egg_speed)
+                     for x, y in zip(swarm.eggs.x.tolist(), swarm.eggs.y.tolist()))
+    return spans
+
+
+def chicken_targets(state):
+    """(center x, bottom, horizontal speed) of every chicken"""
+    targets = [(chicken.x + chicken.width // 2, chicken.y + chicken.height, chicken.speed * chicken.direction)
+               for chicken in state.chickens]
+    swarm = state.swarm
+    if swarm is not None and swarm.chickens.count:
+        width, height = swarm.chicken_size
+        targets.extend((x + width // 2, y + height, swarm.chicken_speed * direction)
+                       for x, y, direction in zip(swarm.chickens.x.tolist(), swarm.chickens.y.tolist(),
+                                                  swarm.chickens.direction.tolist()))
+    return targets
+
+
+def powerup_positions(state):
+    """(center x, center y, fall speed) of every falling power-up"""
+    positions = [(powerup.x, powerup.y, powerup.speed) for powerup in state.powerups]
+    swarm = state.swarm
+    if swarm is not None and swarm.powerups.count:
+        positions.extend((x, y, swarm.powerup_speed)
+                         for x, y in zip(swarm.powerups.x.tolist(), swarm.powerups.y.tolist()))
+    return positions
+
+
+class BotController(Controller):
+    """Dodge eggs, chase reachable power-ups and shoot at the nearest chicken
+
+    Each tick the bot considers holding left, holding still and holding right,
+    and for every egg due within `horizon` ticks checks whether that choice
+    would leave the ship under it while it falls past. It takes the safest
+    choice, breaking ties by moving towards its target: a power-up it can
+    reach in time, otherwise the chicken nearest the ship, led by the time
+    a bullet takes to get there. It fires when a bullet would meet a chicken.
+    """
+
+    def __init__(self, screen_width=800, horizon=45, collect_powerups=True):
+        super().__init__(screen_width)
+        self.horizon = horizon
+        self.collect_powerups = collect_powerups
+
+    def __call__(self, tick, state):
+        player = state.player
+        center = player.x + player.width / 2
+        chickens = chicken_targets(state)
+
+        # Where each chicken will be by the time a bullet fired now reaches it
+        aims = [(x + vx * max(0, player.y - bottom) / BULLET_SPEED, bottom) for x, bottom, vx in chickens]
+
+        target = self.powerup_target(player, center, state)
+        if target is None and aims:
+            target = min(aims, key=lambda aim: math.hypot(aim[0] - center, player.y - aim[1]))[0]
+
+        # Safest direction to hold, then the one that best closes on the target
+        eggs = egg_spans(state)
+        best = None
+        for direction in (-1, 0, 1):
+            danger = self.danger(player, direction, eggs)
+            distance = 0
+            if target is not None:
+                distance = abs(self.position(player, direction, 1) + player.width / 2 - target)
+            if best is None or (danger, distance) < best[0]:
+                best = ((danger, distance), direction)
+        direction = best[1]
+
+        # Fire when a bullet from here would meet a chicken
+        shoot = any(abs(x - center) < 20 for x, _ in aims)
+        return direction < 0, direction > 0, shoot
+
+    def position(self, player, direction, ticks):
+        """Ship's x after holding `direction` for `ticks` ticks"""
+        x = player.x + direction * player.speed * ticks
+        return min(max(x, 0), self.screen_width - player.width)
+
+    def danger(self, player, direction, eggs):
+        """How soon and how often eggs would hit the ship if it held `direction`"""
+        top = player.y + 5
+        danger = 0.0
+        for left, right, bottom, speed in eggs:
+            if bottom > top + player.height:
+                continue  # Already past the ship
+            arrival = max(0, math.ceil((top - bottom) / speed))
+            if arrival > self.horizon:
+                continue
+            # The ship's hitbox sweeps from where it is on arrival to where it is as the egg leaves
+            start = self.position(player, direction, arrival)
+            end = self.position(player, direction, arrival + EGG_DANGER_TICKS)
+            if min(start, end) + 5 < right and max(start, end) + player.width - 5 > left:
+                danger += 1.0 / (1 + arrival)
+        return danger
+
+    def powerup_target(self, player, center, state):
+        """Center x of the nearest power-up the ship can get under in time, or None"""
+        if not self.collect_powerups:
+            return None
+        best = None
+        for x, y, speed in powerup_positions(state):
+            ticks = (player.y - y) / speed
+            if ticks > 0 and abs(x - center) <= player.speed * ticks:
+                if best is None or ticks < best[0]:
+                    best = (ticks, x)
+        return best[1] if best else None
+
+
+# Controllers by name, for command-line options and CHICKEN_INVADERS_CONTROLLER
+CONTROLLERS = {"sweep": SweepController, "bot": BotController}
@@ -0,0 +1,285 @@
+import math
+
+# NumPy is optional - swarm mode is only available when it is installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class EntityArrays:
+    """Structure-of-arrays storage for one kind of entity
+
+    Every field is a contiguous NumPy array; only the first `count` rows are
+    live. Rows are appended in bulk and removed by compacting with a keep mask,
+    so per-frame updates are whole-array operations.
+    """
+
+    def __init__(self, fields, capacity=256):
+        self.fields = fields
+        self.count = 0
+        self.data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in fields.items()}
+
+    def __len__(self):
+        return self.count
+
+    def __getattr__(self, name):
+        # Expose the live slice of each field as an attribute (e.g. chickens.x)
+        data = self.__dict__.get("data")
+        if data is not None and name in data:
+            return data[name][:self.count]
+        raise AttributeError(name)
+
+    def _reserve(self, extra):
+        capacity = len(next(iter(self.data.values())))
+        if self.count + extra <= capacity:
+            return
+        while capacity < self.count + extra:
+            capacity *= 2
+        for name, array in self.data.items():
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            self.data[name] = grown
+
+    def add(self, n=1, **columns):
+        """Append `n` rows; each column is a scalar or an array of length n"""
+        if n <= 0:
+            return
+        self._reserve(n)
+        start, end = self.count, self.count + n
+        for name, array in self.data.items():
+            array[start:end] = columns.get(name, 0)
+        self.count = end
+
+    def keep(self, mask):
+        """Drop every row where `mask` is False, preserving order"""
+        if mask.all():
+            return
+        kept = int(mask.sum())
+        for array in self.data.values():
+            array[:kept] = array[:self.count][mask]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+
+# Bullet kinds in the swarm store
+BULLET_NORMAL = 0
+BULLET_LASER = 1
+BULLET_ANGLE = 2
+
+
+class SwarmWorld:
+    """Chickens, eggs, bullets, power-ups and explosions for "swarm" waves
+
+    Movement, wing/rotation phases, edge bounces, egg drops, culling and
+    collisions all run as vectorized NumPy operations, so waves of hundreds
+    of chickens and thousands of projectiles stay within the frame budget.
+    """
+
+    def __init__(self, width, height, powerup_types, seed=None):
+        self.width = width
+        self.height = height
+        self.powerup_types = powerup_types
+        self.rng = np.random.default_rng(seed)
+
+        # Entity sizes and speeds, matching the object-based classes
+        self.chicken_size = (50, 50)
+        self.chicken_speed = 2
+        self.egg_chance = 0.003
+        self.egg_size = (20, 25)
+        self.egg_speed = 3
+        self.powerup_size = 30
+        self.powerup_speed = 3
+        self.explosion_frames = 10
+        self.explosion_speed = 0.5
+
+        self.chickens = EntityArrays({"x": np.int32, "y": np.int32, "direction": np.int8,
+                                      "wing": np.float64, "wing_speed": np.float64})
+        self.eggs = EntityArrays({"x": np.int32, "y": np.int32, "rotation": np.float64,
+                                  "rotation_speed": np.float64})
+        self.bullets = EntityArrays({"x": np.float64, "y": np.float64, "vx": np.float64,
+                                     "vy": np.float64, "width": np.int32, "height": np.int32,
+                                     "kind": np.int8, "angle": np.int16}, capacity=1024)
+        self.powerups = EntityArrays({"x": np.int32, "y": np.int32, "type": np.int8,
+                                      "offset": np.float64, "speed": np.float64})
+        self.explosions = EntityArrays({"x": np.int32, "y": np.int32, "frame": np.float64})
+
+    def spawn_wave(self, rows, cols, spacing_x=80, spacing_y=60, left=100, top=50):
+        """Add a rectangular formation of chickens"""
+        col, row = np.meshgrid(np.arange(cols), np.arange(rows))
+        n = rows * cols
+        self.chickens.add(n, x=col.ravel() * spacing_x + left, y=row.ravel() * spacing_y + top,
+                          direction=1, wing=self.rng.random(n) * 2 * math.pi,
+                          wing_speed=self.rng.uniform(0.1, 0.15, n))
+
+    def absorb_bullets(self, bullets):
+        """Move freshly fired Bullet objects into the store and empty the list"""
+        for bullet in bullets:
+            if bullet.kind == BULLET_ANGLE:
+                vx, vy, angle = bullet.speed_x, bullet.speed_y, bullet.angle
+            else:
+                vx, vy, angle = 0.0, bullet.speed, 0
+            self.bullets.add(x=bullet.x, y=bullet.y, vx=vx, vy=vy, width=bullet.width,
+                             height=bullet.height, kind=bullet.kind, angle=angle)
+        bullets.clear()
+
+    def update(self):
+        """Advance every entity by one frame"""
+        chickens = self.chickens
+        if chickens.count:
+            chickens.x[:] += self.chicken_speed * chickens.direction
+            chickens.wing[:] += chickens.wing_speed
+            chickens.wing[chickens.wing > 2 * math.pi] -= 2 * math.pi
+
+            # Randomly drop eggs
+            dropping = self.rng.random(chickens.count) < self.egg_chance
+            n = int(dropping.sum())
+            if n:
+                self.eggs.add(n, x=chickens.x[dropping] + self.chicken_size[0] // 2,
+                              y=chickens.y[dropping] + self.chicken_size[1],
+                              rotation_speed=self.rng.uniform(-2, 2, n))
+
+            # Reverse the whole formation and move it down when any chicken hits an edge
+            at_left = (chickens.x <= 0) & (chickens.direction == -1)
+            at_right = (chickens.x + self.chicken_size[0] >= self.width) & (chickens.direction == 1)
+            if at_left.any() or at_right.any():
+                chickens.direction[:] *= -1
+                chickens.y[:] += 20
+
+        eggs = self.eggs
+        if eggs.count:
+            eggs.y[:] += self.egg_speed
+            eggs.rotation[:] += eggs.rotation_speed
+            eggs.rotation[eggs.rotation > 360] -= 360
+            eggs.rotation[eggs.rotation < 0] += 360
+            eggs.keep(eggs.y <= self.height)
+
+        bullets = self.bullets
+        if bullets.count:
+            bullets.x[:] += bullets.vx
+            bullets.y[:] -= bullets.vy
+            bullets.keep((bullets.y >= 0) & (bullets.x >= 0) & (bullets.x <= self.width))
+
+        powerups = self.powerups
+        if powerups.count:
+            powerups.y[:] += self.powerup_speed
+            powerups.offset[:] += powerups.speed
+            powerups.offset[powerups.offset > 2 * math.pi] -= 2 * math.pi
+            powerups.keep(powerups.y <= self.height)
+
+        explosions = self.explosions
+        if explosions.count:
+            explosions.frame[:] += self.explosion_speed
+            explosions.keep(explosions.frame < self.explosion_frames)
+
+    def check_collisions(self, player):
+        """Resolve this frame's collisions
+
+        Returns (chickens killed, eggs that hit the player, power-up types collected).
+        Bullets are matched to chickens in list order, like the object-based game.
+        """
+        kills = 0
+        chickens, bullets = self.chickens, self.bullets
+        if chickens.count and bullets.count:
+            # Bullet boxes vs. chicken hitboxes, all pairs at once
+            bx = (bullets.x - bullets.width // 2).astype(np.int32)
+            by = bullets.y.astype(np.int32)
+            cx, cy = chickens.x + 5, chickens.y + 5
+            cw, ch = self.chicken_size[0] - 10, self.chicken_size[1] - 10
+            hits = ((bx[:, None] < cx + cw) & (bx[:, None] + bullets.width[:, None] > cx) &
+                    (by[:, None] < cy + ch) & (by[:, None] + bullets.height[:, None] > cy))
+
+            bullet_alive = np.ones(bullets.count, dtype=bool)
+            chicken_alive = np.ones(chickens.count, dtype=bool)
+            for i in np.flatnonzero(hits.any(axis=1)):
+                for j in np.flatnonzero(hits[i]):
+                    if chicken_alive[j]:
+                        chicken_alive[j] = False
+                        bullet_alive[i] = False
+            kills = int(chickens.count - chicken_alive.sum())
+
+            if kills:
+                dead = ~chicken_alive
+                centers_x = chickens.x[dead] + self.chicken_size[0] // 2
+                centers_y = chickens.y[dead] + self.chicken_size[1] // 2
+                self.explosions.add(kills, x=centers_x, y=centers_y)
+
+                # 30% chance for each kill to drop a power-up
+                drops = self.rng.random(kills) < 0.3
+                n = int(drops.sum())
+                if n:
+                    self.powerups.add(n, x=centers_x[drops], y=centers_y[drops],
+                                      type=self.rng.integers(0, len(self.powerup_types), n),
+                                      speed=self.rng.uniform(0.05, 0.1, n))
+                chickens.keep(chicken_alive)
+            bullets.keep(bullet_alive)
+
+        # Eggs vs. the player's hitbox
+        egg_hits = 0
+        eggs = self.eggs
+        if eggs.count:
+            ex = eggs.x - self.egg_size[0] // 2 + 5
+            ey = eggs.y + 5
+            px, py = player.x + 5, player.y + 5
+            hit = ((ex < px + player.width - 10) & (ex + self.egg_size[0] - 10 > px) &
+                   (ey < py + player.height - 10) & (ey + self.egg_size[1] - 10 > py))
+            egg_hits = int(hit.sum())
+            if egg_hits:
+                eggs.keep(~hit)
+                self.explosions.add(egg_hits, x=player.x + player.width // 2,
+                                    y=player.y + player.height // 2)
+
+        # Power-ups vs. the player's full rect
+        collected = []
+        powerups = self.powerups
+        if powerups.count:
+            half = self.powerup_size // 2
+            hit = ((powerups.x - half < player.x + player.width) & (powerups.x + half > player.x) &
+                   (powerups.y - half < player.y + player.height) & (powerups.y + half > player.y))
+            if hit.any():
+                collected = [self.powerup_types[t] for t in powerups.type[hit]]
+                powerups.keep(~hit)
+
+        return kills, egg_hits, collected
+
+    def draw(self, screen, images):
+        """Draw every entity, batching the plain sprite blits into Surface.blits calls"""
+        # Pick each chicken's wing-flap frame from its phase
+        chicken_frames = images["chicken_frames"]
+        n = len(chicken_frames)
+        phases = ((self.chickens.wing / (2 * math.pi) * n + 0.5).astype(np.int32) % n).tolist()
+        screen.blits([(chicken_frames[f], (x - 5, y))
+                      for x, y, f in zip(self.chickens.x.tolist(), self.chickens.y.tolist(), phases)],
+                     doreturn=False)
+
+        egg_img = images["egg"]
+        rotations = images["rotations"]
+        for x, y, rotation in zip(self.eggs.x.tolist(), self.eggs.y.tolist(), self.eggs.rotation.tolist()):
+            rotated_img = rotations.get(egg_img, rotation)
+            screen.blit(rotated_img, rotated_img.get_rect(center=(x, y + self.egg_size[1] // 2)))
+
+        powerup_imgs = [images["powerups"][t] for t in self.powerup_types]
+        half = self.powerup_size // 2
+        screen.blits([(powerup_imgs[t], (x - half + int(math.sin(o) * 5), y - half + int(math.cos(o) * 3)))
+                      for x, y, t, o in zip(self.powerups.x.tolist(), self.powerups.y.tolist(),
+                                            self.powerups.type.tolist(), self.powerups.offset.tolist())],
+                     doreturn=False)
+
+        bullet_imgs = {BULLET_NORMAL: images["bullet"], BULLET_LASER: images["laser_bullet"]}
+        angle_imgs = images["angle_bullets"]
+        screen.blits([(bullet_imgs[k] if k != BULLET_ANGLE else angle_imgs[a], (int(x) - wd // 2, int(y)))
+                      for x, y, wd, k, a in zip(self.bullets.x.tolist(), self.bullets.y.tolist(),
+                                                self.bullets.width.tolist(), self.bullets.kind.tolist(),
+                                                self.bullets.angle.tolist())],
+                     doreturn=False)
+
+        self.draw_explosions(screen, images)
+
+    def draw_explosions(self, screen, images):
+        frames = images["explosion_frames"]
+        screen.blits([(frames[min(int(f), len(frames) - 1)], (x - 25, y - 25))
+                      for x, y, f in zip(self.explosions.x.tolist(), self.explosions.y.tolist(),
+                                         self.explosions.frame.tolist())],
+                     doreturn=False)
@@ -0,0 +1,171 @@
+"""Run the game logic with no window, no audio and no frame cap.
+
+Useful for soak tests, balance tuning and load testing on machines without a
+display, and for replaying recorded sessions:
+
+    python headless.py --frames 100000 --seed 1
+    python headless.py --frames 216000 --controller bot
+    python headless.py --frames 3600 --seed 1 --record session.cir
+    python headless.py --replay session.cir
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ["CHICKEN_INVADERS_HEADLESS"] = "1"
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import chicken_invaders as game
+from controllers import CONTROLLERS
+from replay import InputLog, check_seed, pack_input
+
+
+def make_controller(name="sweep"):
+    """Build one of the named controllers for the game's screen"""
+    return CONTROLLERS[name](game.SCREEN_WIDTH)
+
+
+def simulate(frames, seed=None, controls=None, restart=True):
+    """Step the game for `frames` ticks and return a summary of what happened
+
+    `controls(frame, state)` returns the (left, right, shoot) input for each
+    tick (by default a SweepController; see controllers.py). A lost game is
+    restarted on the next tick unless `restart` is False.
+    The summary's "log" is the session's InputLog, ready to save.
+    """
+    # Let background asset building finish so it doesn't compete with the timings
+    game.assets.wait(list(game.assets.events))
+    log, state = game.start_session(seed)
+    controls = controls or make_controller()
+
+    scores = []
+    peak_entities = 0
+    restart_next = False
+    start = time.perf_counter()
+    for frame in range(frames):
+        left, right, shoot = controls(frame, state)
+        bits = pack_input(left, right, shoot, restart_next)
+        state = game.run_tick(state, bits)
+        log.record(bits)
+        restart_next = False
+        peak_entities = max(peak_entities, sum(state.entity_counts().values()))
+        if state.game_over:
+            scores.append(state.score)
+            if not restart:
+                frames = frame + 1
+                break
+            restart_next = True
+    elapsed = time.perf_counter() - start
+    game.finish_session(log, state)
+
+    return {
+        "frames": frames,
+        "seconds": elapsed,
+        "frames_per_second": frames / elapsed if elapsed else float("inf"),
+        "games_finished": len(scores),
+        "scores": scores,
+        "score": state.score,
+        "lives": state.lives,
+        "peak_entities": peak_entities,
+        "log": log,
+    }
+
+
+def play_game(seed, max_ticks=36000, controls=None):
+    """Play one seeded game until it is lost or `max_ticks` pass, and return how it went"""
+    state = game.new_game(seed)
+    controls = controls or make_controller()
+    peaks = dict.fromkeys(("chickens", "eggs", "bullets", "powerups", "explosions"), 0)
+    for tick in range(max_ticks):
+        left, right, shoot = controls(tick, state)
+        game.step_game(state, left, right, shoot)
+        for kind, count in state.entity_counts().items():
+            if count > peaks[kind]:
+                peaks[kind] = count
+        if state.game_over:
+            break
+    return {
+        "seed": seed,
+        "ticks": state.ticks,
+        "survived": not state.game_over,
+        "score": state.score,
+        "lives": state.lives,
+        "peak_entities": peaks,
+    }
+
+
+def replay(log, slowest=5):
+    """Re-run a recorded session tick by tick and return a summary, including its slowest ticks
+
+    "matches" tells whether the session ended exactly as it did when recorded.
+    """
+    game.assets.wait(list(game.assets.events))
+    game.apply_settings(log.settings)
+    session, state = game.start_session(log.seed)
+
+    tick_times = []
+    start = time.perf_counter()
+    for bits in log:
+        tick_start = time.perf_counter()
+        state = game.run_tick(state, bits)
+        tick_times.append(time.perf_counter() - tick_start)
+        session.record(bits)
+    elapsed = time.perf_counter() - start
+    game.finish_session(session, state)
+
+    slowest_ticks = sorted(range(len(tick_times)), key=tick_times.__getitem__, reverse=True)[:slowest]
+    return {
+        "ticks": session.ticks,
+        "seconds": elapsed,
+        "ticks_per_second": session.ticks / elapsed if elapsed else float("inf"),
+        "result": session.result,
+        "recorded": log.result,
+        "matches": session.result == log.result,
+        "slowest_ticks": [(tick, tick_times[tick] * 1000) for tick in sorted(slowest_ticks)],
+    }
+
+
+def seed_argument(text):
+    """argparse type for --seed: an integer a replay file can store"""
+    try:
+        return check_seed(int(text))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=36000, help="ticks to simulate (default: 10 minutes at 60 FPS)")
+    parser.add_argument("--seed", type=seed_argument, default=None, help="seed for the game's random numbers")
+    parser.add_argument("--no-restart", action="store_true", help="stop at the first game over")
+    parser.add_argument("--controller", choices=sorted(CONTROLLERS), default="sweep",
+                        help="scripted player: sweep (back and forth) or bot (dodges and aims)")
+    parser.add_argument("--record", metavar="PATH", help="save the simulated session's seed and inputs")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded session instead of simulating")
+    args = parser.parse_args()
+
+    if args.replay:
+        result = replay(InputLog.load(args.replay))
+        print("Replayed %d ticks in %.2f s (%.0f ticks/s)" %
+              (result["ticks"], result["seconds"], result["ticks_per_second"]))
+        print("Slowest ticks: %s" % ", ".join("%d (%.2f ms)" % tick for tick in result["slowest_ticks"]))
+        if result["matches"]:
+            print("Matched the recording: score %d, lives %d" % (result["result"]["score"], result["result"]["lives"]))
+        else:
+            print("Diverged from the recording: %s, recorded %s" % (result["result"], result["recorded"]))
+            sys.exit(1)
+        return
+
+    result = simulate(args.frames, args.seed, make_controller(args.controller), restart=not args.no_restart)
+    if args.record:
+        result["log"].save(args.record)
+    print("Simulated %d frames in %.2f s (%.0f frames/s)" %
+          (result["frames"], result["seconds"], result["frames_per_second"]))
+    print("Games finished: %d, scores: %s" % (result["games_finished"], result["scores"]))
+    print("Current game: score %d, lives %d" % (result["score"], result["lives"]))
+    print("Peak entity count: %d" % result["peak_entities"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,29 @@
+import math
 import pygame
 import random
 
-def create_stars(width, height, count=100):
-    """Create a starfield background surface"""
+from images.convert import convert_asset, OPAQUE, COLORKEY
+
+def create_stars(width, height, count=100, rng=random):
+    """Create a starfield background surface, drawing positions and colors from `rng`"""
     surface = pygame.Surface((width, height))
     surface.fill((0, 0, 0))  # Black background
     
     # Add stars of different sizes and brightness
     for _ in range(count):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        size = random.randint(1, 3)
-        brightness = random.randint(150, 255)
+        x = rng.randint(0, width - 1)
+        y = rng.randint(0, height - 1)
+        size = rng.randint(1, 3)
+        brightness = rng.randint(150, 255)
         color = (brightness, brightness, brightness)
         pygame.draw.circle(surface, color, (x, y), size)
     
     # Add some colored nebula-like effects
     for _ in range(5):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        radius = random.randint(50, 150)
-        color_choice = random.choice([(20, 0, 40), (0, 20, 40), (40, 0, 20)])
+        x = rng.randint(0, width - 1)
+        y = rng.randint(0, height - 1)
+        radius = rng.randint(50, 150)
+        color_choice = rng.choice([(20, 0, 40), (0, 20, 40), (40, 0, 20)])
         
         # Create a surface for the nebula with alpha channel
         nebula = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
@@ -36,13 +39,13 @@ def create_stars(width, height, count=100):
     
     return surface
 
-def create_planet(radius=80):
-    """Create a planet surface"""
+def create_planet(radius=80, rng=random):
+    """Create a planet surface, drawing its colors and craters from `rng`"""
     size = radius * 2
     surface = pygame.Surface((size, size), pygame.SRCALPHA)
     
     # Choose a planet color scheme
-    base_color = random.choice([
+    base_color = rng.choice([
         (150, 100, 50),  # Mars-like
         (60, 120, 180),  # Neptune-like
         (180, 160, 80),  # Saturn-like
@@ -54,14 +57,14 @@ def create_planet(radius=80):
     
     # Add some surface details/craters
     for _ in range(20):
-        crater_x = random.randint(radius//2, size - radius//2)
-        crater_y = random.randint(radius//2, size - radius//2)
+        crater_x = rng.randint(radius//2, size - radius//2)
+        crater_y = rng.randint(radius//2, size - radius//2)
         
         # Only draw craters that are on the planet surface
         dist = ((crater_x - radius)**2 + (crater_y - radius)**2)**0.5
         if dist < radius * 0.9:
-            crater_size = random.randint(2, 10)
-            shade = random.randint(-30, 30)
+            crater_size = rng.randint(2, 10)
+            shade = rng.randint(-30, 30)
             crater_color = (
                 max(0, min(255, base_color[0] + shade)),
                 max(0, min(255, base_color[1] + shade)),
@@ -70,3 +73,71 @@ def create_planet(radius=80):
             pygame.draw.circle(surface, crater_color, (crater_x, crater_y), crater_size)
     
     return surface
+
+class StarField:
+    """Seeded starfield background with twinkling stars and optional parallax layers
+
+    The static stars come from `create_stars`. On top of them a fixed set of
+    stars twinkle through brightness cycles that are worked out up front, and
+    each parallax layer is a pre-rendered sheet of stars scrolling down the
+    screen. Every star is a cached sprite, so each frame costs the same few
+    blits and the same seed always produces the same frames.
+    """
+
+    def __init__(self, width, height, count=100, twinkle_count=40, layers=(), seed=None,
+                 brightness_levels=8):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.frame = 0
+        self.background = convert_asset(create_stars(width, height, count, self.rng), OPAQUE)
+
+        # One sprite per (size, brightness level), shared by every twinkling star
+        self.sprites = {}
+        for size in range(1, 4):
+            for level in range(brightness_levels):
+                brightness = 150 + 105 * level // (brightness_levels - 1)
+                sprite = pygame.Surface((2 * size + 1, 2 * size + 1), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (brightness, brightness, brightness), (size, size), size)
+                self.sprites[size, level] = convert_asset(sprite, COLORKEY)
+
+        # Each twinkling star loops through its own precomputed cycle of sprites
+        self.twinkles = []
+        for _ in range(twinkle_count):
+            x = self.rng.randint(0, width - 1)
+            y = self.rng.randint(0, height - 1)
+            size = self.rng.randint(1, 3)
+            period = self.rng.randint(40, 120)
+            phase = self.rng.random()
+            cycle = []
+            for f in range(period):
+                wave = 0.5 + 0.5 * math.sin(2 * math.pi * (f / period + phase))
+                cycle.append(self.sprites[size, int(wave * (brightness_levels - 1) + 0.5)])
+            self.twinkles.append(((x - size, y - size), cycle))
+
+        # Parallax layers: (star sheet, pixels scrolled per frame)
+        self.layers = []
+        for star_count, speed in layers:
+            sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+            for _ in range(star_count):
+                brightness = self.rng.randint(80, 200)
+                pygame.draw.circle(sheet, (brightness, brightness, brightness),
+                                   (self.rng.randint(0, width - 1), self.rng.randint(0, height - 1)),
+                                   self.rng.randint(1, 2))
+            self.layers.append((convert_asset(sheet, COLORKEY), speed))
+
+    def update(self):
+        """Advance the twinkle and scroll animation by one frame"""
+        self.frame += 1
+
+    def draw(self, surface):
+        """Draw the parallax layers and twinkling stars; returns the rects drawn"""
+        rects = []
+        for sheet, speed in self.layers:
+            offset = int(self.frame * speed) % self.height
+            rects.append(surface.blit(sheet, (0, offset)))
+            rects.append(surface.blit(sheet, (0, offset - self.height)))
+        frame = self.frame
+        rects.extend(surface.blits([(cycle[frame % len(cycle)], position)
+                                    for position, cycle in self.twinkles]))
+        return rects
@@ -0,0 +1,44 @@
+import pygame
+
+# How a generated surface is stored once the display exists
+OPAQUE = "opaque"  # No transparency at all (backgrounds)
+COLORKEY = "colorkey"  # Pixels are either fully opaque or fully transparent
+ALPHA = "alpha"  # Real per-pixel alpha (glows, trails)
+
+# Transparent pixels of colorkey sprites are filled with this color
+COLORKEY_COLOR = (255, 0, 255)
+
+def convert_surface(surface, mode=ALPHA, alpha_threshold=128):
+    """Return a copy of a surface in the display's pixel format
+
+    COLORKEY keeps pixels with at least `alpha_threshold` alpha as opaque and
+    keys out the rest, which blits faster than per-pixel alpha.
+    """
+    if mode == OPAQUE:
+        return surface.convert()
+    if mode == COLORKEY:
+        mask = pygame.mask.from_surface(surface, alpha_threshold)
+        keyed = pygame.Surface(surface.get_size()).convert()
+        mask.to_surface(keyed, setsurface=surface.convert(), unsetcolor=COLORKEY_COLOR)
+        keyed.set_colorkey(COLORKEY_COLOR, pygame.RLEACCEL)
+        return keyed
+    return surface.convert_alpha()
+
+def convert_asset(asset, mode=ALPHA):
+    """Convert a surface, or every surface in a list or dict, to the display format
+
+    Returns the asset unchanged while there is no display to convert to.
+    """
+    if pygame.display.get_surface() is None:
+        return asset
+    if isinstance(asset, pygame.Surface):
+        return convert_surface(asset, mode)
+    if isinstance(asset, dict):
+        return {key: convert_asset(value, mode) for key, value in asset.items()}
+    if isinstance(asset, (list, tuple)):
+        return type(asset)(convert_asset(value, mode) for value in asset)
+    return asset
+
+def finalizer(mode):
+    """Return a function converting an asset with the given mode, for AssetRegistry.add"""
+    return lambda asset: convert_asset(asset, mode)
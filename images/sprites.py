@@ -69,6 +69,24 @@ def create_chicken(width=50, height=50):
     
     return surface
 
+def create_chicken_frames(width=50, height=50, frames=12):
+    """Create one wing-flap cycle of chicken frames
+
+    The wings stick out 5 pixels past each side of the chicken, so frames are
+    10 pixels wider than it; blit them at (x - 5, y).
+    """
+    base = create_chicken(width, height)
+    wing_color = (240, 240, 240)
+    strip = []
+    for i in range(frames):
+        wing_offset = int(math.sin(2 * math.pi * i / frames) * 5)
+        surface = pygame.Surface((width + 10, height), pygame.SRCALPHA)
+        surface.blit(base, (5, 0))
+        pygame.draw.ellipse(surface, wing_color, (0, height // 2 - 10 + wing_offset, 15, 25))
+        pygame.draw.ellipse(surface, wing_color, (width - 5, height // 2 - 10 - wing_offset, 15, 25))
+        strip.append(surface)
+    return strip
+
 def create_egg(width=20, height=25):
     """Create an egg surface"""
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
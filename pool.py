@@ -0,0 +1,93 @@
+class ObjectPool:
+    """Fixed-capacity pool of reusable game objects
+
+    The pool doubles as the container of live objects: it can be iterated,
+    indexed, sliced and tested for membership like the list it replaces.
+    `acquire(cls, ...)` reuses a released instance of `cls` (re-initialized
+    through its `reset` method) and `release(obj)` returns one in O(1) by
+    swapping the last live object into its slot, so live order is not kept.
+
+    Up to `capacity` released objects of each class are kept for reuse; if
+    more are live at once, extra instances are allocated and counted in
+    `overflows`.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.live = []
+        self.free = {}
+        self.high_water = 0
+        self.allocations = 0
+        self.overflows = 0
+
+    def prefill(self, cls, count=None):
+        """Allocate spare instances of `cls` up front so the frame loop never has to"""
+        free = self.free.setdefault(cls, [])
+        while len(free) < min(self.capacity, count or self.capacity):
+            free.append(cls.__new__(cls))
+            self.allocations += 1
+
+    def acquire(self, cls, *args):
+        """Return a live instance of `cls` initialized with `args`"""
+        free = self.free.get(cls)
+        if free:
+            obj = free.pop()
+        else:
+            obj = cls.__new__(cls)
+            self.allocations += 1
+            if len(self.live) >= self.capacity:
+                self.overflows += 1
+        obj.reset(*args)
+        obj._pool_index = len(self.live)
+        self.live.append(obj)
+        if len(self.live) > self.high_water:
+            self.high_water = len(self.live)
+        return obj
+
+    def release(self, obj):
+        """Return a live object to the pool, swap-removing it from the live list"""
+        index = obj._pool_index
+        last = self.live.pop()
+        if last is not obj:
+            self.live[index] = last
+            last._pool_index = index
+        obj._pool_index = -1
+        free = self.free.setdefault(type(obj), [])
+        if len(free) < self.capacity:
+            free.append(obj)
+
+    # List-style aliases so game code written against lists keeps working
+    remove = release
+
+    def clear(self):
+        """Release every live object"""
+        while self.live:
+            self.release(self.live[-1])
+
+    @property
+    def live_count(self):
+        return len(self.live)
+
+    @property
+    def free_count(self):
+        return sum(len(free) for free in self.free.values())
+
+    def stats(self):
+        return {"live": self.live_count, "free": self.free_count, "high_water": self.high_water,
+                "allocations": self.allocations, "overflows": self.overflows}
+
+    def __len__(self):
+        return len(self.live)
+
+    def __bool__(self):
+        return bool(self.live)
+
+    def __iter__(self):
+        return iter(self.live)
+
+    def __getitem__(self, index):
+        return self.live[index]
+
+    def __contains__(self, obj):
+        index = getattr(obj, "_pool_index", -1)
+        return 0 <= index < len(self.live) and self.live[index] is obj
@@ -0,0 +1,140 @@
+import csv
+import json
+import math
+import time
+from collections import deque
+from itertools import islice
+
+import pygame
+
+# Frame budget at 60 FPS, in milliseconds
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class FrameProfiler:
+    """Per-phase frame timings over a rolling window of recent frames
+
+    Call `start_frame()` at the top of the loop, `mark(phase)` at the end of
+    each stage (the time since the previous mark is charged to that phase) and
+    `end_frame(counts)` once the frame is presented. Phases are reported in
+    the order they were first seen.
+    """
+
+    def __init__(self, window=3600, refresh_frames=30):
+        self.window = window
+        self.refresh_frames = refresh_frames
+        self.records = deque(maxlen=window)
+        self.phases = []
+        self.current = {}
+        self.frame_start = None
+        self.last = None
+        self.frame_index = 0
+        self._stats = {}
+        self._stats_frame = -1
+
+    def start_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+        self.current = {}
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to `phase`"""
+        now = time.perf_counter()
+        if self.last is not None:
+            self.current[phase] = self.current.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def end_frame(self, counts=None):
+        """Close the frame, recording its phase times (ms) and entity counts"""
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        record = {"frame": self.frame_index, "total": (now - self.frame_start) * 1000}
+        for phase, seconds in self.current.items():
+            if phase not in self.phases:
+                self.phases.append(phase)
+            record[phase] = seconds * 1000
+        if counts:
+            record.update(counts)
+        self.records.append(record)
+        self.frame_index += 1
+        self.frame_start = self.last = None
+
+    def stats(self):
+        """Return {phase: (p50, p95, p99)} in ms, recomputed every `refresh_frames` frames"""
+        if self._stats_frame < 0 or self.frame_index - self._stats_frame >= self.refresh_frames:
+            self._stats = {}
+            for phase in ["total"] + self.phases:
+                values = sorted(record.get(phase, 0.0) for record in self.records)
+                self._stats[phase] = (percentile(values, 0.5), percentile(values, 0.95),
+                                      percentile(values, 0.99))
+            self._stats_frame = self.frame_index
+        return self._stats
+
+    def dump(self, path):
+        """Write the recorded frames to `path` as JSON (.json) or CSV (anything else)"""
+        records = list(self.records)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"phases": self.phases, "percentiles": self.stats(), "frames": records}, f)
+            return
+        columns = ["frame", "total"] + self.phases
+        for record in records:
+            columns.extend(key for key in record if key not in columns)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+            writer.writeheader()
+            writer.writerows(records)
+
+    def draw(self, surface, font, text_cache, position=(10, 50), graph_frames=240, graph_height=60):
+        """Draw the frame-time graph, per-phase percentiles and entity counts; returns the rect drawn"""
+        x, y = position
+        stats = self.stats()
+        white = (255, 255, 255)
+
+        # Table of percentiles, one rendered cell per value so the columns line up
+        rows = [["phase (ms)", "p50", "p95", "p99"]]
+        rows.extend([phase] + ["%.2f" % value for value in values] for phase, values in stats.items())
+        cells = [[text_cache.render(font, text, True, white) for text in row] for row in rows]
+        name_width = max(row[0].get_width() for row in cells) + 10
+        value_width = max(cell.get_width() for row in cells for cell in row[1:]) + 10
+        counts = None
+        if self.records:
+            counts = text_cache.render(font, "  ".join(
+                "%s %d" % (key, value) for key, value in self.records[-1].items()
+                if key != "frame" and key != "total" and key not in self.phases), True, white)
+
+        line_height = font.get_linesize()
+        table_width = name_width + 3 * value_width
+        width = max(graph_frames, table_width, counts.get_width() if counts else 0) + 20
+        height = graph_height + 15 + line_height * (len(rows) + 1)
+        panel = pygame.Rect(x, y, width, height)
+        surface.fill((0, 0, 0), panel)
+
+        # Frame-time graph, scaled so the 60 FPS budget line sits halfway up
+        scale = graph_height / (2 * FRAME_BUDGET_MS)
+        bottom = y + 5 + graph_height
+        recent = islice(self.records, max(0, len(self.records) - graph_frames), None)
+        for i, record in enumerate(recent):
+            bar = min(graph_height, int(record["total"] * scale))
+            color = (0, 200, 0) if record["total"] <= FRAME_BUDGET_MS else (230, 40, 40)
+            pygame.draw.line(surface, color, (x + 10 + i, bottom), (x + 10 + i, bottom - bar))
+        budget_y = bottom - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(surface, (255, 255, 0), (x + 10, budget_y), (x + 10 + graph_frames, budget_y))
+
+        text_y = bottom + 10
+        for row in cells:
+            surface.blit(row[0], (x + 10, text_y))
+            for column, cell in enumerate(row[1:]):
+                right = x + 10 + name_width + (column + 1) * value_width
+                surface.blit(cell, (right - cell.get_width(), text_y))
+            text_y += line_height
+        if counts:
+            surface.blit(counts, (x + 10, text_y))
+        return panel
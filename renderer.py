@@ -0,0 +1,69 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Draw frames over a static backdrop, presenting only what changed
+
+    Each frame starts with `begin()`, which repaints the backdrop, then the
+    game draws as usual and hands the rects it drew to `add()`. `present()`
+    shows the frame. With dirty rects off, every frame repaints the whole
+    backdrop and flips the display. With them on, `begin()` only restores
+    the backdrop under last frame's rects, and `present()` pushes last
+    frame's and this frame's rects with `pygame.display.update`. It falls
+    back to a full flip when more than `max_dirty_fraction` of the screen
+    changed, or after `invalidate()`.
+    """
+
+    def __init__(self, screen, dirty_rects=False, max_dirty_fraction=0.4):
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        self.max_dirty_area = max_dirty_fraction * screen.get_width() * screen.get_height()
+        self.backdrop = None
+        self.previous = []
+        self.current = []
+        self.invalid = True
+        self.full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def set_backdrop(self, surface):
+        self.backdrop = surface
+        self.invalidate()
+
+    def invalidate(self):
+        """Redraw and present the whole screen, this frame and the next"""
+        self.invalid = True
+        self.full = True
+
+    def begin(self):
+        """Start a frame by repainting the backdrop where it was drawn over"""
+        self.full = self.invalid or not self.dirty_rects
+        self.invalid = False
+        if self.full:
+            self.screen.blit(self.backdrop, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.backdrop, rect, rect)
+        self.current = []
+
+    def add(self, *rects):
+        """Record rects drawn this frame"""
+        self.current.extend(rects)
+
+    def add_all(self, rects):
+        self.current.extend(rects)
+
+    def present(self):
+        """Show the frame, pushing only the changed rects when possible"""
+        if self.dirty_rects and not self.full:
+            dirty = self.previous + self.current
+            if sum(rect.width * rect.height for rect in dirty) <= self.max_dirty_area:
+                pygame.display.update(dirty)
+                self.partial_frames += 1
+            else:
+                pygame.display.flip()
+                self.full_frames += 1
+        else:
+            pygame.display.flip()
+            self.full_frames += 1
+        self.previous = self.current
@@ -0,0 +1,103 @@
+import json
+import struct
+
+# Input bits packed into one byte per tick
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_SHOOT = 4
+INPUT_RESTART = 8
+
+MAGIC = b"CIRP"
+VERSION = 1
+
+# magic, format version, tick rate, RNG seed, metadata length, run count
+HEADER = struct.Struct("<4sBHQII")
+# input bits, number of consecutive ticks they were held for
+RUN = struct.Struct("<BH")
+MAX_RUN = 0xFFFF
+
+# Seeds are stored as unsigned 64-bit integers
+MAX_SEED = 2 ** 64 - 1
+
+
+def pack_input(left=False, right=False, shoot=False, restart=False):
+    """Pack one tick's controls into input bits"""
+    return ((INPUT_LEFT if left else 0) | (INPUT_RIGHT if right else 0) |
+            (INPUT_SHOOT if shoot else 0) | (INPUT_RESTART if restart else 0))
+
+
+def check_seed(seed):
+    """Return `seed` if a replay file can store it, else raise ValueError"""
+    if not 0 <= seed <= MAX_SEED:
+        raise ValueError("seed must be between 0 and %d, got %d" % (MAX_SEED, seed))
+    return seed
+
+
+def unpack_input(bits):
+    """Return (left, right, shoot, restart) from input bits"""
+    return (bool(bits & INPUT_LEFT), bool(bits & INPUT_RIGHT),
+            bool(bits & INPUT_SHOOT), bool(bits & INPUT_RESTART))
+
+
+class InputLog:
+    """A game session as its RNG seed plus the input of every tick
+
+    Inputs are stored run-length encoded, since controls are usually held for
+    many ticks, so an hour of play takes a few kilobytes. `settings` holds the
+    options the session was played with and `result` what it ended with
+    (score, lives, state checksum), so a replay can check it came out the same.
+    """
+
+    def __init__(self, seed, tick_rate, settings=None):
+        self.seed = check_seed(seed)
+        self.tick_rate = tick_rate
+        self.settings = settings or {}
+        self.result = {}
+        self.runs = []  # [bits, ticks] pairs
+        self.ticks = 0
+
+    def __len__(self):
+        return self.ticks
+
+    def __iter__(self):
+        """Yield the input bits of every tick in order"""
+        for bits, count in self.runs:
+            for _ in range(count):
+                yield bits
+
+    def record(self, bits):
+        """Append one tick's input bits"""
+        runs = self.runs
+        if runs and runs[-1][0] == bits and runs[-1][1] < MAX_RUN:
+            runs[-1][1] += 1
+        else:
+            runs.append([bits, 1])
+        self.ticks += 1
+
+    def save(self, path):
+        meta = json.dumps({"settings": self.settings, "result": self.result},
+                          sort_keys=True).encode("utf-8")
+        # Pack everything first, so a failure can't leave a truncated file behind
+        data = b"".join([HEADER.pack(MAGIC, VERSION, self.tick_rate, self.seed, len(meta), len(self.runs)),
+                         meta] + [RUN.pack(bits, count) for bits, count in self.runs])
+        with open(path, "wb") as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, tick_rate, seed, meta_length, run_count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("%s is not a replay file" % path)
+        if version != VERSION:
+            raise ValueError("%s has replay format version %d, expected %d" % (path, version, VERSION))
+        offset = HEADER.size
+        meta = json.loads(data[offset:offset + meta_length].decode("utf-8"))
+        offset += meta_length
+
+        log = cls(seed, tick_rate, meta["settings"])
+        log.result = meta["result"]
+        log.runs = [list(run) for run in RUN.iter_unpack(data[offset:offset + run_count * RUN.size])]
+        log.ticks = sum(count for _, count in log.runs)
+        return log
@@ -0,0 +1,167 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import wave
+
+# Bump whenever the synthesis output changes so stale entries are never reused
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def default_cache_dir():
+    """Return the cache directory, honouring CHICKEN_INVADERS_CACHE_DIR and XDG_CACHE_HOME"""
+    directory = os.environ.get("CHICKEN_INVADERS_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "chicken_invaders", "sounds")
+
+
+def wav_bytes(pcm, sample_rate, channels, sample_width=2):
+    """Wrap raw PCM data in a WAV header"""
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(sample_width)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return out.getvalue()
+
+
+class AssetCache:
+    """Content-addressed WAV cache for synthesized sounds
+
+    Entries are named by a hash of the generator parameters and the audio format,
+    so any change to a sound spec produces a new entry. The total size is kept
+    under `max_bytes` by evicting the least recently used files.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or default_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("CHICKEN_INVADERS_CACHE_SIZE", DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Entries handed out by this cache are never evicted while it is alive
+        self.in_use = set()
+
+    def key(self, name, params):
+        """Hash the sound name, its parameters and the cache version"""
+        payload = json.dumps({"name": name, "params": params, "version": CACHE_VERSION},
+                             sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".wav")
+
+    def load(self, name, params):
+        """Return the cached file path for these parameters, or None if there is no valid entry"""
+        path = self.path(self.key(name, params))
+        try:
+            with wave.open(path, "rb") as w:
+                valid = (w.getframerate() == params["sample_rate"]
+                         and w.getnchannels() == params["channels"]
+                         and w.getsampwidth() == params["sample_width"]
+                         and w.getnframes() > 0)
+        except (OSError, EOFError, wave.Error):
+            return None
+        if not valid:
+            return None
+
+        # Mark the entry as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def store(self, name, params, pcm):
+        """Write a PCM buffer to the cache and return its path
+
+        Raises OSError when the cache directory is not writable.
+        """
+        path = self.path(self.key(name, params))
+        data = wav_bytes(pcm, params["sample_rate"], params["channels"], params["sample_width"])
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict()
+        return path
+
+    def fetch(self, name, params, build):
+        """Return a loadable source for a sound, building and caching it on a miss
+
+        The result is a file path, or an in-memory WAV file object when the
+        cache directory cannot be written (e.g. on read-only installs).
+        """
+        path = self.load(name, params)
+        if path:
+            self.hits += 1
+            self.in_use.add(path)
+            return path
+
+        self.misses += 1
+        pcm = build()
+        self.in_use.add(self.path(self.key(name, params)))
+        try:
+            return self.store(name, params, pcm)
+        except OSError:
+            data = wav_bytes(pcm, params["sample_rate"], params["channels"], params["sample_width"])
+            return io.BytesIO(data)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits within max_bytes"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        entries = []
+        total = 0
+        for filename in names:
+            if not filename.endswith(".wav"):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path in self.in_use:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every cached entry"""
+        max_bytes = self.max_bytes
+        in_use = self.in_use
+        self.max_bytes = 0
+        self.in_use = set()
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+            self.in_use = in_use
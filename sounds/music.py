@@ -0,0 +1,116 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from sounds.synth import render_music
+
+
+class ProceduralProgression:
+    """Endless, non-repeating chord sequence for the streamed music
+
+    Each bar moves to a random chord from the palette (never repeating the
+    previous one). Only the most recent bars are remembered, so memory use
+    does not grow with the length of the track.
+    """
+
+    def __init__(self, chord_count, seed=None, history=8):
+        self.chord_count = chord_count
+        self.rng = random.Random(seed)
+        self.history = history
+        self.chosen = {}
+        self.last_bar = -1
+
+    def __call__(self, bar):
+        while self.last_bar < bar:
+            if self.last_bar < 0 or self.chord_count < 2:
+                # Open on the first chord of the palette
+                choice = 0
+            else:
+                # Skip over the previous chord so consecutive bars always differ
+                choice = self.rng.randrange(self.chord_count - 1)
+                if choice >= self.chosen[self.last_bar]:
+                    choice += 1
+            self.last_bar += 1
+            self.chosen[self.last_bar] = choice
+            self.chosen.pop(self.last_bar - self.history, None)
+        return self.chosen[bar]
+
+
+class MusicStream:
+    """Background music generated in small chunks and fed to a reserved mixer channel
+
+    Only the chunk that is playing, the one queued behind it and the one being
+    rendered are held in memory. Chunks are rendered one ahead on a background
+    thread, so `update()` - which must be called regularly (once per frame) to
+    keep the queue topped up - only hands finished chunks to the mixer.
+    """
+
+    def __init__(self, spec, make_sound, chunk_seconds=0.5, procedural=False, seed=None,
+                 volume=0.3, channel_id=0):
+        self.spec = spec
+        self.make_sound = make_sound
+        self.chunk_seconds = chunk_seconds
+        self.chunk_frames = int(chunk_seconds * spec["sample_rate"])
+        self.sequence = ProceduralProgression(len(spec["chords"]), seed) if procedural else None
+        self.volume = volume
+        self.channel_id = channel_id
+        self.channel = None
+        self.position = 0  # Next frame to render
+        self.chunks_rendered = 0
+        # One worker renders chunks strictly in order
+        self.renderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music")
+        self.pending = None  # Future of the next chunk's PCM
+
+    def _render_chunk(self):
+        """Render the next chunk of the track as PCM (runs on the render thread)"""
+        pcm = render_music(self.spec, start=self.position, length=self.chunk_seconds,
+                           sequence=self.sequence)
+        self.position += self.chunk_frames
+        self.chunks_rendered += 1
+        return pcm
+
+    def _next_chunk(self, wait=True):
+        """Return the next chunk as a Sound and start rendering the one after it
+
+        Without `wait`, returns None if the next chunk isn't rendered yet.
+        """
+        if self.pending is None:
+            self.pending = self.renderer.submit(self._render_chunk)
+        if not wait and not self.pending.done():
+            return None
+        sound = self.make_sound(self.pending.result(), 2)
+        self.pending = self.renderer.submit(self._render_chunk)
+        return sound
+
+    def start(self):
+        """Begin playback on the reserved channel"""
+        if self.channel is not None:
+            return
+        # Keep effects from ever grabbing the music channel
+        pygame.mixer.set_reserved(self.channel_id + 1)
+        self.channel = pygame.mixer.Channel(self.channel_id)
+        self.channel.set_volume(self.volume)
+        self.channel.play(self._next_chunk())
+        self.channel.queue(self._next_chunk())
+
+    def update(self):
+        """Queue the next chunk once the previous queued one has started playing"""
+        if self.channel is None:
+            return
+        if not self.channel.get_busy():
+            # We fell behind (e.g. a long stall) - restart the stream where it left off
+            self.channel.play(self._next_chunk())
+        if self.channel.get_queue() is None:
+            # The queued chunk has half a second of playback to finish rendering
+            chunk = self._next_chunk(wait=False)
+            if chunk is not None:
+                self.channel.queue(chunk)
+
+    def stop(self):
+        """Stop playback and release the channel"""
+        if self.channel is None:
+            return
+        self.channel.stop()
+        self.channel = None
+        pygame.mixer.set_reserved(0)
@@ -1,12 +1,95 @@
-import pygame
+import io
 import os
-import random
-import math
+import time
+
+import pygame
+
+from sounds.cache import AssetCache, wav_bytes
+from sounds.music import MusicStream
+from sounds.synth import convert_channels, render_effect, render_music
+
+# Synthesis parameters for each sound effect
+EFFECT_SPECS = {
+    # Laser: decreasing frequency
+    "shoot": {"duration": 0.2, "volume": 0.3, "start": 1000, "slope": -800,
+              "attack": 0.05, "release": 0.1},
+    # Explosion: noise mixed with a falling low tone
+    "explosion": {"duration": 0.5, "volume": 0.5, "start": 200, "slope": -180,
+                  "noise": 0.7, "attack": 0.05, "release": 0.2},
+    # Power-up: ascending tone
+    "powerup": {"duration": 0.4, "volume": 0.7, "start": 500, "slope": 1000,
+                "attack": 0.05, "release": 0.1},
+    # Hit: half noise, half falling tone
+    "hit": {"duration": 0.3, "volume": 0.4, "start": 300, "slope": -200,
+            "noise": 0.5, "attack": 0.02, "release": 0.1},
+}
+
+# Synthesis parameters for the background music loop
+MUSIC_SPEC = {
+    "duration": 10.0,
+    "volume": 0.3,
+    "chords": [
+        [261.63, 329.63, 392.00],  # C major
+        [293.66, 349.23, 440.00],  # D minor
+        [329.63, 392.00, 493.88],  # E minor
+        [349.23, 440.00, 523.25],  # F major
+    ],
+    "rate": 8,  # Arpeggio notes per second
+    "detune": 1.01,  # Right channel slightly different for stereo effect
+    "tremolo": 0.5,  # Subtle volume envelope in Hz
+}
+
+# The one mixer configuration used for every sound: 44.1 kHz, signed 16-bit, stereo
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 1024
+
+def init_mixer():
+    """Open the audio device once with the game's mixer configuration
+
+    If the mixer is already open (e.g. by pygame.init()), it is left alone and its
+    format is adopted instead. Returns the (frequency, size, channels) in use.
+    """
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+    return pygame.mixer.get_init()
+
+# Background music modes
+MUSIC_LOOP = "loop"  # Prebuilt 10 second track, looped by pygame.mixer.music
+MUSIC_STREAM = "stream"  # The same track, generated in chunks on demand
+MUSIC_PROCEDURAL = "procedural"  # Endless, non-repeating chord progression, generated in chunks
 
 class SoundManager:
-    def __init__(self):
-        # Initialize pygame mixer
-        pygame.mixer.init()
+    def __init__(self, cache=None, in_memory=None, music_mode=None, music_seed=None, executor=None):
+        # Startup timings in seconds, keyed by phase
+        self.timings = {}
+        
+        # Optional concurrent.futures executor to synthesize sounds in parallel
+        self.executor = executor
+        
+        # Initialize pygame mixer once; every sound is rendered in its format
+        start = time.perf_counter()
+        self.frequency, self.size, self.channels = init_mixer()
+        self.timings["mixer_init"] = time.perf_counter() - start
+        
+        # Build sounds straight from memory instead of going through WAV files
+        if in_memory is None:
+            in_memory = os.environ.get("CHICKEN_INVADERS_IN_MEMORY_SOUNDS") == "1"
+        self.in_memory = in_memory
+        
+        # Persistent cache for the synthesized sound files
+        self.cache = cache or AssetCache()
+        
+        # How the background music is produced
+        if music_mode is None:
+            music_mode = os.environ.get("CHICKEN_INVADERS_MUSIC", MUSIC_LOOP)
+        self.music_mode = music_mode
+        self.music_stream = None
+        if music_mode in (MUSIC_STREAM, MUSIC_PROCEDURAL):
+            self.music_stream = MusicStream(self._spec("background"), self._sound_from_pcm,
+                                            procedural=music_mode == MUSIC_PROCEDURAL,
+                                            seed=music_seed)
         
         # Sound effects dictionary
         self.sounds = {}
@@ -18,249 +101,130 @@ class SoundManager:
         self.background_music_playing = False
     
     def _create_sounds(self):
-        """Create synthetic sound effects since we don't have actual sound files"""
-        sounds_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Create shoot sound
-        self._create_shoot_sound(os.path.join(sounds_dir, "shoot.wav"))
-        
-        # Create explosion sound
-        self._create_explosion_sound(os.path.join(sounds_dir, "explosion.wav"))
-        
-        # Create powerup sound
-        self._create_powerup_sound(os.path.join(sounds_dir, "powerup.wav"))
-        
-        # Create hit sound
-        self._create_hit_sound(os.path.join(sounds_dir, "hit.wav"))
-        
-        # Create background music
-        self._create_background_music(os.path.join(sounds_dir, "background.wav"))
-        
-        # Load the created sounds
-        self.sounds["shoot"] = pygame.mixer.Sound(os.path.join(sounds_dir, "shoot.wav"))
-        self.sounds["explosion"] = pygame.mixer.Sound(os.path.join(sounds_dir, "explosion.wav"))
-        self.sounds["powerup"] = pygame.mixer.Sound(os.path.join(sounds_dir, "powerup.wav"))
-        self.sounds["hit"] = pygame.mixer.Sound(os.path.join(sounds_dir, "hit.wav"))
-        
-        # Set volumes
+        """Create synthetic sound effects, reusing cached files from earlier launches"""
+        if self.in_memory:
+            self._create_sounds_in_memory()
+            return
+        
+        # Create (or load) each sound effect
+        builders = self._start_synthesis(include_music=self.music_stream is None)
+        for name in EFFECT_SPECS:
+            build = builders[name]
+            start = time.perf_counter()
+            self.sounds[name] = pygame.mixer.Sound(
+                self.cache.fetch(name, self._sound_params(name, 1), build))
+            self.timings[name] = time.perf_counter() - start
+        
+        # Create (or load) background music; streamed music is generated as it plays
+        if self.music_stream is None:
+            start = time.perf_counter()
+            self.background_music = self.cache.fetch(
+                "background", self._sound_params("background", 2), builders["background"])
+            self.timings["background"] = time.perf_counter() - start
+        
+        self._set_volumes()
+    
+    def _create_sounds_in_memory(self):
+        """Create synthetic sound effects from in-memory buffers, without any file I/O"""
+        builders = self._start_synthesis(include_music=self.music_stream is None)
+        for name in EFFECT_SPECS:
+            start = time.perf_counter()
+            self.sounds[name] = self._sound_from_pcm(builders[name](), 1)
+            self.timings[name] = time.perf_counter() - start
+        
+        # pygame.mixer.music can only stream from a file object, so wrap the music in a WAV header
+        if self.music_stream is None:
+            start = time.perf_counter()
+            self.background_music = io.BytesIO(wav_bytes(builders["background"](), self.frequency, 2))
+            self.timings["background"] = time.perf_counter() - start
+        
+        self._set_volumes()
+    
+    def _sound_from_pcm(self, pcm, channels):
+        """Create a Sound from 16-bit PCM rendered at the mixer frequency"""
+        if self.size != -16:
+            # Let SDL convert to the mixer's sample format
+            return pygame.mixer.Sound(file=io.BytesIO(wav_bytes(pcm, self.frequency, channels)))
+        
+        # Match the mixer's channel layout; matching buffers are handed over without a copy
+        return pygame.mixer.Sound(buffer=convert_channels(pcm, channels, self.channels))
+    
+    def _start_synthesis(self, include_music=True):
+        """Return a PCM builder for each sound, submitting uncached ones to the executor
+
+        With an executor, every sound that will actually need synthesizing starts
+        rendering in parallel right away and its builder just waits for the result.
+        """
+        builders = {
+            "shoot": self._create_shoot_sound,
+            "explosion": self._create_explosion_sound,
+            "powerup": self._create_powerup_sound,
+            "hit": self._create_hit_sound,
+            "background": self._create_background_music,
+        }
+        if self.executor is None:
+            return builders
+        
+        for name in builders:
+            if name == "background" and not include_music:
+                continue
+            channels = 2 if name == "background" else 1
+            if not self.in_memory and self.cache.load(name, self._sound_params(name, channels)):
+                continue
+            render = render_music if name == "background" else render_effect
+            builders[name] = self.executor.submit(render, self._spec(name)).result
+        return builders
+    
+    def _set_volumes(self):
+        """Set the effect volumes"""
         self.sounds["shoot"].set_volume(0.3)
         self.sounds["explosion"].set_volume(0.5)
         self.sounds["powerup"].set_volume(0.7)
         self.sounds["hit"].set_volume(0.4)
     
-    def _create_shoot_sound(self, filename):
+    def _spec(self, name):
+        """Return the synthesis spec for a sound, rendered at the mixer frequency"""
+        spec = MUSIC_SPEC if name == "background" else EFFECT_SPECS[name]
+        return dict(spec, sample_rate=self.frequency)
+    
+    def _sound_params(self, name, channels):
+        """Cache key parameters: the synthesis spec plus the output format"""
+        spec = self._spec(name)
+        return {
+            "spec": spec,
+            "sample_rate": spec["sample_rate"],
+            "channels": channels,
+            "sample_width": 2,
+        }
+    
+    def _create_shoot_sound(self):
         """Create a laser shoot sound effect"""
-        pygame.mixer.quit()
-        pygame.mixer.init(44100, -16, 1, 1024)
-        
-        sample_rate = 44100
-        duration = 0.2  # seconds
-        volume = 0.3
-        
-        # Create a buffer for the sound
-        buffer = bytearray()
-        
-        # Generate a simple laser sound
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            freq = 1000 - 800 * t  # Decreasing frequency
-            value = int(volume * 32767 * math.sin(2 * 3.14159 * freq * t))
-            
-            # Apply envelope
-            if t < 0.05:
-                # Attack
-                value = int(value * (t / 0.05))
-            elif t > duration - 0.1:
-                # Release
-                value = int(value * ((duration - t) / 0.1))
-            
-            # Convert to 16-bit signed value
-            buffer.extend(value.to_bytes(2, byteorder='little', signed=True))
-        
-        # Save the sound to a file
-        with open(filename, 'wb') as f:
-            f.write(buffer)
-        
-        pygame.mixer.quit()
-        pygame.mixer.init()
+        return render_effect(self._spec("shoot"))
     
-    def _create_explosion_sound(self, filename):
+    def _create_explosion_sound(self):
         """Create an explosion sound effect"""
-        pygame.mixer.quit()
-        pygame.mixer.init(44100, -16, 1, 1024)
-        
-        sample_rate = 44100
-        duration = 0.5  # seconds
-        volume = 0.5
-        
-        # Create a buffer for the sound
-        buffer = bytearray()
-        
-        # Generate a noise-based explosion sound
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            
-            # Mix noise with decreasing frequency
-            noise = random.uniform(-1, 1)
-            freq = 200 - 180 * t
-            tone = math.sin(2 * 3.14159 * freq * t)
-            
-            # Mix noise and tone
-            value = int(volume * 32767 * (0.7 * noise + 0.3 * tone))
-            
-            # Apply envelope
-            if t < 0.05:
-                # Attack
-                value = int(value * (t / 0.05))
-            elif t > duration - 0.2:
-                # Release
-                value = int(value * ((duration - t) / 0.2))
-            
-            # Convert to 16-bit signed value
-            buffer.extend(value.to_bytes(2, byteorder='little', signed=True))
-        
-        # Save the sound to a file
-        with open(filename, 'wb') as f:
-            f.write(buffer)
-        
-        pygame.mixer.quit()
-        pygame.mixer.init()
+        return render_effect(self._spec("explosion"))
     
-    def _create_powerup_sound(self, filename):
+    def _create_powerup_sound(self):
         """Create a power-up collection sound effect"""
-        pygame.mixer.quit()
-        pygame.mixer.init(44100, -16, 1, 1024)
-        
-        sample_rate = 44100
-        duration = 0.4  # seconds
-        volume = 0.7
-        
-        # Create a buffer for the sound
-        buffer = bytearray()
-        
-        # Generate an ascending tone
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            freq = 500 + 1000 * t  # Increasing frequency
-            value = int(volume * 32767 * math.sin(2 * 3.14159 * freq * t))
-            
-            # Apply envelope
-            if t < 0.05:
-                # Attack
-                value = int(value * (t / 0.05))
-            elif t > duration - 0.1:
-                # Release
-                value = int(value * ((duration - t) / 0.1))
-            
-            # Convert to 16-bit signed value
-            buffer.extend(value.to_bytes(2, byteorder='little', signed=True))
-        
-        # Save the sound to a file
-        with open(filename, 'wb') as f:
-            f.write(buffer)
-        
-        pygame.mixer.quit()
-        pygame.mixer.init()
+        return render_effect(self._spec("powerup"))
     
-    def _create_hit_sound(self, filename):
+    def _create_hit_sound(self):
         """Create a hit sound effect"""
-        pygame.mixer.quit()
-        pygame.mixer.init(44100, -16, 1, 1024)
-        
-        sample_rate = 44100
-        duration = 0.3  # seconds
-        volume = 0.4
-        
-        # Create a buffer for the sound
-        buffer = bytearray()
-        
-        # Generate a hit sound
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            
-            # Mix noise with decreasing frequency
-            noise = random.uniform(-1, 1)
-            freq = 300 - 200 * t
-            tone = math.sin(2 * 3.14159 * freq * t)
-            
-            # Mix noise and tone
-            value = int(volume * 32767 * (0.5 * noise + 0.5 * tone))
-            
-            # Apply envelope
-            if t < 0.02:
-                # Attack
-                value = int(value * (t / 0.02))
-            elif t > duration - 0.1:
-                # Release
-                value = int(value * ((duration - t) / 0.1))
-            
-            # Convert to 16-bit signed value
-            buffer.extend(value.to_bytes(2, byteorder='little', signed=True))
-        
-        # Save the sound to a file
-        with open(filename, 'wb') as f:
-            f.write(buffer)
-        
-        pygame.mixer.quit()
-        pygame.mixer.init()
+        return render_effect(self._spec("hit"))
     
-    def _create_background_music(self, filename):
+    def _create_background_music(self):
         """Create a simple background music loop"""
-        pygame.mixer.quit()
-        pygame.mixer.init(44100, -16, 2, 1024)
-        
-        sample_rate = 44100
-        duration = 10.0  # seconds
-        volume = 0.3
-        
-        # Create a buffer for the sound (stereo)
-        buffer = bytearray()
-        
-        # Base frequencies for a simple chord progression
-        chord_progression = [
-            [261.63, 329.63, 392.00],  # C major
-            [293.66, 349.23, 440.00],  # D minor
-            [329.63, 392.00, 493.88],  # E minor
-            [349.23, 440.00, 523.25]   # F major
-        ]
-        
-        chord_duration = duration / len(chord_progression)
-        
-        # Generate a simple background music
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            chord_idx = int(t / chord_duration) % len(chord_progression)
-            chord = chord_progression[chord_idx]
-            
-            # Create a simple arpeggio effect
-            arp_idx = int(t * 8) % 3
-            freq = chord[arp_idx]
-            
-            # Add some variation
-            if int(t * 2) % 2 == 0:
-                freq /= 2  # Octave down sometimes
-            
-            # Generate left and right channel
-            left_value = int(volume * 16384 * math.sin(2 * 3.14159 * freq * t))
-            
-            # Right channel slightly different for stereo effect
-            right_value = int(volume * 16384 * math.sin(2 * 3.14159 * (freq * 1.01) * t))
-            
-            # Apply subtle envelope
-            env_mod = 0.8 + 0.2 * math.sin(2 * 3.14159 * 0.5 * t)
-            left_value = int(left_value * env_mod)
-            right_value = int(right_value * env_mod)
-            
-            # Convert to 16-bit signed values
-            buffer.extend(left_value.to_bytes(2, byteorder='little', signed=True))
-            buffer.extend(right_value.to_bytes(2, byteorder='little', signed=True))
-        
-        # Save the sound to a file
-        with open(filename, 'wb') as f:
-            f.write(buffer)
-        
-        pygame.mixer.quit()
-        pygame.mixer.init()
+        return render_music(self._spec("background"))
+    
+    def startup_report(self):
+        """Return a human-readable summary of where SoundManager startup time went"""
+        lines = ["Sound startup (mixer %d Hz, %d-bit, %d channel(s), opened once):"
+                 % (self.frequency, abs(self.size), self.channels)]
+        for phase, seconds in self.timings.items():
+            lines.append("  %-12s %8.2f ms" % (phase, seconds * 1000))
+        lines.append("  %-12s %8.2f ms" % ("total", sum(self.timings.values()) * 1000))
+        return "\n".join(lines)
     
     def play_sound(self, sound_name):
         """Play a sound effect"""
@@ -270,13 +234,27 @@ class SoundManager:
     def play_background_music(self):
         """Start playing background music"""
         if not self.background_music_playing:
-            pygame.mixer.music.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "background.wav"))
-            pygame.mixer.music.set_volume(0.3)
-            pygame.mixer.music.play(-1)  # Loop indefinitely
+            if self.music_stream is not None:
+                self.music_stream.start()
+            else:
+                source = self.background_music
+                if hasattr(source, "seek"):
+                    source.seek(0)
+                pygame.mixer.music.load(source)
+                pygame.mixer.music.set_volume(0.3)
+                pygame.mixer.music.play(-1)  # Loop indefinitely
             self.background_music_playing = True
     
     def stop_background_music(self):
         """Stop background music"""
         if self.background_music_playing:
-            pygame.mixer.music.stop()
+            if self.music_stream is not None:
+                self.music_stream.stop()
+            else:
+                pygame.mixer.music.stop()
             self.background_music_playing = False
+    
+    def update(self):
+        """Keep streamed background music fed; call once per frame"""
+        if self.music_stream is not None and self.background_music_playing:
+            self.music_stream.update()
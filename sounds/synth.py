@@ -0,0 +1,217 @@
+import math
+import random
+import sys
+from array import array
+
+# NumPy is optional - without it every generator falls back to plain Python lists
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SAMPLE_RATE = 44100
+MAX_AMPLITUDE = 32767
+
+
+def time_axis(duration, sample_rate=SAMPLE_RATE, start=0):
+    """Return the sample times (in seconds) for a sound of the given duration
+
+    `start` is the index of the first sample, so consecutive segments of one
+    long sound line up exactly.
+    """
+    count = int(duration * sample_rate)
+    if np is not None:
+        return np.arange(start, start + count, dtype=np.float64) / sample_rate
+    return [i / sample_rate for i in range(start, start + count)]
+
+
+def sweep(t, start, slope=0.0):
+    """Sine oscillator whose frequency moves linearly from `start` by `slope` Hz/s"""
+    if np is not None:
+        return np.sin(2 * math.pi * (start + slope * t) * t)
+    return [math.sin(2 * math.pi * (start + slope * x) * x) for x in t]
+
+
+def oscillator(t, freq):
+    """Sine oscillator driven by a per-sample frequency array"""
+    if np is not None:
+        return np.sin(2 * math.pi * freq * t)
+    return [math.sin(2 * math.pi * f * x) for f, x in zip(freq, t)]
+
+
+def noise(count, rng=None):
+    """Uniform white noise in the range [-1, 1]"""
+    rng = rng or random
+    if np is not None:
+        generator = np.random.default_rng(rng.getrandbits(64))
+        return generator.uniform(-1, 1, count)
+    return [rng.uniform(-1, 1) for _ in range(count)]
+
+
+def envelope(t, duration, attack, release):
+    """Linear attack/release gain curve, flat at 1.0 in between"""
+    if np is not None:
+        gain = np.ones_like(t)
+        rising = t < attack
+        gain[rising] = t[rising] / attack
+        falling = ~rising & (t > duration - release)
+        gain[falling] = (duration - t[falling]) / release
+        return gain
+
+    gain = []
+    for x in t:
+        if x < attack:
+            gain.append(x / attack)
+        elif x > duration - release:
+            gain.append((duration - x) / release)
+        else:
+            gain.append(1.0)
+    return gain
+
+
+def arpeggio(t, chords, duration, rate=8, octave_rate=2, sequence=None):
+    """Per-sample frequency for an arpeggio cycling through a chord progression
+
+    Each chord lasts an equal share of `duration`, its notes are stepped through
+    `rate` times a second and every other `1 / octave_rate` seconds the note
+    drops an octave. `sequence` optionally maps a bar number to the index of the
+    chord played in it; by default the chords simply repeat in order.
+    """
+    chord_duration = duration / len(chords)
+    if np is not None:
+        table = np.array(chords, dtype=np.float64)
+        bars = (t / chord_duration).astype(np.int64)
+        if sequence is None:
+            chord_idx = bars % len(chords)
+        else:
+            # Only a handful of bars fall in one buffer, so look each one up once
+            unique_bars, inverse = np.unique(bars, return_inverse=True)
+            chord_idx = np.array([sequence(int(bar)) for bar in unique_bars], dtype=np.int64)[inverse]
+        arp_idx = (t * rate).astype(np.int64) % table.shape[1]
+        freq = table[chord_idx, arp_idx]
+        octave_down = (t * octave_rate).astype(np.int64) % 2 == 0
+        freq[octave_down] /= 2
+        return freq
+
+    count = len(chords)
+    freq = []
+    for x in t:
+        bar = int(x / chord_duration)
+        chord = chords[bar % count if sequence is None else sequence(bar)]
+        f = chord[int(x * rate) % len(chord)]
+        freq.append(f / 2 if int(x * octave_rate) % 2 == 0 else f)
+    return freq
+
+
+def to_pcm16(samples, scale=MAX_AMPLITUDE):
+    """Scale samples in [-1, 1] and pack them as little-endian signed 16-bit PCM"""
+    if np is not None:
+        values = np.clip(np.asarray(samples) * scale, -32768, 32767)
+        return values.astype('<i2').tobytes()
+
+    # Generators keep their samples within [-1, 1], so no clipping pass is needed here
+    pcm = array('h', [int(s * scale) for s in samples])
+    if sys.byteorder == 'big':
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def convert_channels(pcm, channels, target):
+    """Convert 16-bit PCM between mono and stereo
+
+    Returns a buffer object that pygame can consume directly; when the layout
+    already matches, the input is passed through as a memoryview without copying.
+    """
+    if channels == target:
+        return memoryview(pcm)
+
+    if np is not None:
+        samples = np.frombuffer(pcm, dtype='<i2')
+        if target > channels:
+            return np.repeat(samples, target // channels)
+        frames = samples.reshape(-1, channels).astype(np.int32)
+        return frames.mean(axis=1).astype('<i2')
+
+    samples = array('h', pcm)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    if target > channels:
+        out = array('h', [s for s in samples for _ in range(target // channels)])
+    else:
+        out = array('h', [sum(samples[i:i + channels]) // channels
+                          for i in range(0, len(samples), channels)])
+    if sys.byteorder == 'big':
+        out.byteswap()
+    return out
+
+
+def interleave(left, right):
+    """Merge two mono channels into one stereo frame sequence"""
+    if np is not None:
+        return np.column_stack((left, right)).ravel()
+    frames = []
+    for l, r in zip(left, right):
+        frames.append(l)
+        frames.append(r)
+    return frames
+
+
+def render_effect(spec, rng=None):
+    """Render a mono sound effect described by `spec` into 16-bit PCM bytes
+
+    The spec holds `duration`, `volume`, the swept tone `start`/`slope`, the
+    `noise` mix (0 for a pure tone) and the envelope `attack`/`release` times.
+    """
+    sample_rate = spec.get("sample_rate", SAMPLE_RATE)
+    duration = spec["duration"]
+    t = time_axis(duration, sample_rate)
+
+    signal = sweep(t, spec["start"], spec.get("slope", 0.0))
+    mix = spec.get("noise", 0.0)
+    if mix:
+        hiss = noise(len(t), rng)
+        if np is not None:
+            signal = mix * hiss + (1 - mix) * signal
+        else:
+            signal = [mix * n + (1 - mix) * s for n, s in zip(hiss, signal)]
+
+    gain = envelope(t, duration, spec["attack"], spec["release"])
+    volume = spec["volume"]
+    if np is not None:
+        return to_pcm16(volume * signal * gain)
+    return to_pcm16([volume * s * g for s, g in zip(signal, gain)])
+
+
+def render_music(spec, start=0, length=None, sequence=None):
+    """Render the stereo arpeggio music loop described by `spec` into 16-bit PCM bytes
+
+    The spec holds `duration`, `volume`, the `chords` to cycle through, the
+    arpeggio `rate`, the right channel `detune` factor and the `tremolo` rate.
+    Passing a `start` frame and a `length` in seconds renders just that segment
+    of an endless track, and `sequence` picks the chord for each bar (see
+    `arpeggio`).
+    """
+    sample_rate = spec.get("sample_rate", SAMPLE_RATE)
+    duration = spec["duration"]
+    t = time_axis(duration if length is None else length, sample_rate, start)
+
+    freq = arpeggio(t, spec["chords"], duration, spec.get("rate", 8), sequence=sequence)
+    detune = spec.get("detune", 1.0)
+    tremolo = spec.get("tremolo", 0.5)
+    scale = spec["volume"] * spec.get("level", 0.5)
+
+    if np is not None:
+        gain = scale * (0.8 + 0.2 * np.sin(2 * math.pi * tremolo * t))
+        left = oscillator(t, freq) * gain
+        right = oscillator(t, freq * detune) * gain
+        return to_pcm16(interleave(left, right))
+
+    # Single pass over the frames keeps the fallback within the per-sample loop's cost
+    sin = math.sin
+    two_pi = 2 * math.pi
+    frames = []
+    for x, f in zip(t, freq):
+        g = scale * (0.8 + 0.2 * sin(two_pi * tremolo * x))
+        frames.append(sin(two_pi * f * x) * g)
+        frames.append(sin(two_pi * f * detune * x) * g)
+    return to_pcm16(frames)
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+
+import pygame
+
+# Default angle step in degrees and memory budget for rotated sprites
+ROTATION_STEP = 5
+ROTATION_CACHE_BYTES = 4 * 1024 * 1024
+
+
+class RotationCache:
+    """Rotated copies of sprites at quantized angles, shared by every entity
+
+    `get(image, angle)` snaps the angle to the nearest multiple of `step`
+    degrees and returns that rotation, rendering it on first use. Rotations
+    are evicted least-recently-used first once they take up more than
+    `max_bytes` of pixel data.
+    """
+
+    def __init__(self, step=ROTATION_STEP, max_bytes=ROTATION_CACHE_BYTES):
+        self.step = step
+        self.max_bytes = max_bytes
+        self.steps = max(1, int(round(360 / step)))
+        self.frames = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _index(self, angle):
+        return int(round(angle / self.step)) % self.steps
+
+    def get(self, image, angle):
+        """Return `image` rotated by `angle` degrees, to the nearest step"""
+        key = (image, self._index(angle))
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.hits += 1
+            self.frames.move_to_end(key)
+            return frame
+        self.misses += 1
+        frame = pygame.transform.rotate(image, key[1] * 360 / self.steps)
+        self.frames[key] = frame
+        self.bytes += frame.get_width() * frame.get_height() * frame.get_bytesize()
+        self.evict()
+        return frame
+
+    def prerender(self, image, angles=None):
+        """Render `image` at every step (or just the given angles) ahead of time"""
+        if angles is None:
+            angles = [index * 360 / self.steps for index in range(self.steps)]
+        for angle in angles:
+            self.get(image, angle)
+
+    def evict(self):
+        # Always keep the most recent rotation, even if it alone is over budget
+        while self.bytes > self.max_bytes and len(self.frames) > 1:
+            _, frame = self.frames.popitem(last=False)
+            self.bytes -= frame.get_width() * frame.get_height() * frame.get_bytesize()
+
+    def clear(self):
+        self.frames.clear()
+        self.bytes = 0
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, text, antialias, color)
+
+    `render` takes the same arguments as Font.render and only renders text it
+    hasn't seen recently, so unchanged HUD text costs a dictionary lookup.
+    The least recently used surfaces are dropped beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
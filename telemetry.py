@@ -0,0 +1,271 @@
+"""Per-tick session telemetry in a compact fixed-width binary format.
+
+Summarize the latest session in a log (and the files rotated out of it) from
+the repository root:
+
+    python telemetry.py telemetry.bin
+"""
+import math
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+
+# NumPy is optional - it only speeds up bulk reads
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"CITL"
+VERSION = 1
+
+# magic, format version, record size, tick rate, session start (Unix time, shared by a session's files)
+HEADER = struct.Struct("<4sBHHd")
+# tick, score, lives, chickens, eggs, bullets, powerups, explosions, active power-up, frame time (ms)
+RECORD = struct.Struct("<IIhHHHHHBxf")
+FIELDS = ("tick", "score", "lives", "chickens", "eggs", "bullets", "powerups", "explosions",
+          "powerup", "frame_ms")
+COUNT_FIELDS = FIELDS[3:8]
+
+# Active power-up codes
+POWERUPS = (None, "triple", "laser", "multi")
+POWERUP_CODES = {name: code for code, name in enumerate(POWERUPS)}
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+
+
+def rotated_paths(path, backups=DEFAULT_BACKUPS):
+    """Existing files of a rotated log, oldest first"""
+    paths = ["%s.%d" % (path, i) for i in range(backups, 0, -1)] + [path]
+    return [p for p in paths if os.path.exists(p)]
+
+
+def session_paths(path, backups=DEFAULT_BACKUPS):
+    """Files of the newest session in a rotated log, oldest first"""
+    paths = rotated_paths(path, backups)
+    if not paths:
+        return []
+    started = [TelemetryLog.read_started(p) for p in paths]
+    first = len(paths) - 1
+    while first > 0 and started[first - 1] == started[-1]:
+        first -= 1
+    return paths[first:]
+
+
+class TelemetryWriter:
+    """Buffer telemetry records and write them to disk from a background thread
+
+    Records are packed into a buffer on the calling thread, which is handed to
+    the writer thread every `flush_records` records, so a tick only pays for a
+    struct.pack. When the file would grow past `max_bytes` it is rotated like
+    logging's RotatingFileHandler: path -> path.1 -> path.2 ... up to `backups`.
+    """
+
+    def __init__(self, path, tick_rate, max_bytes=DEFAULT_MAX_BYTES, backups=DEFAULT_BACKUPS,
+                 flush_records=600):
+        self.path = path
+        self.tick_rate = tick_rate
+        self.max_bytes = max(max_bytes, HEADER.size + RECORD.size)
+        self.backups = backups
+        self.flush_size = flush_records * RECORD.size
+        self.buffer = bytearray()
+        self.records = 0
+        self.rotations = 0
+        self.file = None
+        self.file_size = 0
+        # Every file of the session carries its start time, which tells sessions apart
+        self.started = time.time()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._write_loop, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def record(self, tick, score, lives, counts, powerup, frame_ms):
+        """Append one tick's record; `counts` is a dict holding each of COUNT_FIELDS"""
+        self.buffer += RECORD.pack(tick, score, lives, counts["chickens"], counts["eggs"],
+                                   counts["bullets"], counts["powerups"], counts["explosions"],
+                                   POWERUP_CODES.get(powerup, 0), frame_ms)
+        self.records += 1
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        """Hand the buffered records to the writer thread"""
+        if self.buffer:
+            self.queue.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def close(self):
+        """Write out everything recorded so far and stop the writer thread"""
+        self.flush()
+        self.queue.put(None)
+        self.thread.join()
+
+    def _write_loop(self):
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                break
+            self._write(chunk)
+        if self.file is not None:
+            self.file.close()
+
+    def _write(self, chunk):
+        # Split the chunk on record boundaries wherever the file fills up
+        while chunk:
+            if self.file is None or self.file_size + RECORD.size > self.max_bytes:
+                self._open_next()
+            room = (self.max_bytes - self.file_size) // RECORD.size * RECORD.size
+            part, chunk = chunk[:room], chunk[room:]
+            self.file.write(part)
+            self.file_size += len(part)
+        self.file.flush()
+
+    def _open_next(self):
+        if self.file is not None:
+            self.file.close()
+            self.rotations += 1
+        # Like RotatingFileHandler, never truncate: an earlier session's log is rotated out too
+        if os.path.exists(self.path):
+            for i in range(self.backups - 1, 0, -1):
+                if os.path.exists("%s.%d" % (self.path, i)):
+                    os.replace("%s.%d" % (self.path, i), "%s.%d" % (self.path, i + 1))
+            if self.backups:
+                os.replace(self.path, self.path + ".1")
+        self.file = open(self.path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.tick_rate, self.started))
+        self.file_size = HEADER.size
+
+
+class TelemetryLog:
+    """Memory-mapped, read-only view of one telemetry file
+
+    Records are decoded on demand: index it, iterate it, pull out one
+    `column()`, or get every record at once with `array()` (needs NumPy).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError("%s is not a telemetry log" % path)
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.tick_rate, self.started = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError("%s is not a telemetry log" % path)
+        if version != VERSION or record_size != RECORD.size:
+            raise ValueError("%s has telemetry format version %d, expected %d" % (path, version, VERSION))
+        # A partly written last record (the game was killed mid-write) is ignored
+        self.count = (size - HEADER.size) // RECORD.size
+
+    @staticmethod
+    def read_started(path):
+        """Session start time from a log's header, without mapping the file"""
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC:
+            return None
+        return HEADER.unpack(header)[4]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        try:
+            self.map.close()
+        except BufferError:
+            # A zero-copy array() is still alive; the map closes when it is collected
+            pass
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("telemetry record index out of range")
+        return RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size)
+
+    def __iter__(self):
+        end = HEADER.size + self.count * RECORD.size
+        return RECORD.iter_unpack(memoryview(self.map)[HEADER.size:end])
+
+    def column(self, name):
+        """Every record's value of one field, as a list"""
+        index = FIELDS.index(name)
+        return [record[index] for record in self]
+
+    def array(self, copy=False):
+        """Every record as a NumPy structured array
+
+        By default the array is a view of the mapped file and stays valid
+        after the log is closed, keeping the map open until it is dropped.
+        Pass copy=True to get an independent array instead.
+        """
+        dtype = np.dtype({"names": FIELDS,
+                          "formats": ["<u4", "<u4", "<i2", "<u2", "<u2", "<u2", "<u2", "<u2", "u1", "<f4"],
+                          "offsets": [0, 4, 8, 10, 12, 14, 16, 18, 20, 22],
+                          "itemsize": RECORD.size})
+        records = np.frombuffer(self.map, dtype=dtype, count=self.count, offset=HEADER.size)
+        return records.copy() if copy else records
+
+
+def summarize(paths):
+    """Return a summary of the records in `paths`, read in order"""
+    frame_times = []
+    peaks = dict.fromkeys(COUNT_FIELDS, 0)
+    last = None
+    records = 0
+    for path in paths:
+        with TelemetryLog(path) as log:
+            records += len(log)
+            for record in log:
+                frame_times.append(record[9])
+                for i, name in enumerate(COUNT_FIELDS, 3):
+                    if record[i] > peaks[name]:
+                        peaks[name] = record[i]
+                last = record
+    frame_times.sort()
+    frame_ms = {}
+    if frame_times:
+        # Nearest-rank percentiles
+        frame_ms = {"p50": frame_times[math.ceil(0.5 * len(frame_times)) - 1],
+                    "p99": frame_times[math.ceil(0.99 * len(frame_times)) - 1],
+                    "max": frame_times[-1]}
+    return {
+        "records": records,
+        "frame_ms": frame_ms,
+        "peaks": peaks,
+        "last": dict(zip(FIELDS, last)) if last else None,
+    }
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("usage: python telemetry.py <log path>")
+        return 2
+    paths = session_paths(sys.argv[1])
+    if not paths:
+        print("No telemetry log at %s" % sys.argv[1])
+        return 1
+    summary = summarize(paths)
+    print("%d ticks in %d file(s)" % (summary["records"], len(paths)))
+    if summary["frame_ms"]:
+        print("Frame time: p50 %(p50).2f ms, p99 %(p99).2f ms, max %(max).2f ms" % summary["frame_ms"])
+    print("Peak entities: %s" % ", ".join("%s %d" % item for item in summary["peaks"].items()))
+    if summary["last"]:
+        print("Last tick %(tick)d: score %(score)d, lives %(lives)d" % summary["last"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())